@@ -0,0 +1,200 @@
+"""
+Offline benchmarks for the scraper's parsing and rendering hot paths.
+
+Everything runs against the saved pages in fixtures/, so no request is made
+to the ratings site. Each benchmark reports throughput (ops/sec and mean
+time per call), the memory allocated while one call runs (peak traced
+allocation) and the memory still held after it (retained). The process'
+peak RSS is printed at the end.
+
+Run from the repository root:
+
+    python benchmarks/bench_parse.py                   # everything
+    python benchmarks/bench_parse.py -k profile        # names containing "profile"
+    python benchmarks/bench_parse.py --engine lxml     # one HTML engine only
+    python benchmarks/bench_parse.py --json out.json   # also save results
+"""
+
+import argparse
+import glob
+import json
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from html_engines import available_engines, parse_html
+from rank_system import get_rank_progress, get_ranks_from_xp
+from records import compact_leaderboard
+from parsers import parse_leaderboard, parse_player_profile
+from rtanks_scraper import RTanksScraper
+from utils import translate_russian_to_english
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# Strings translate_russian_to_english sees in practice: groups, equipment and paints
+TRANSLATION_SAMPLES = [
+    "Клан", "Игрок", "Фриз M3", "Смоки M0", "Хорнет M2", "Диктатор M3",
+    "Фотон", "Граффити", "Ирбис", "Штаб-сержант", "Генерал-майор", "Легенда 3"
+]
+
+# XP values spread over every rank, including max rank
+XP_SAMPLES = [0, 99, 1500, 47512, 125919, 412930, 999999, 1600000, 1712004]
+
+
+def load_fixture(name: str) -> bytes:
+    with open(os.path.join(FIXTURES_DIR, name), 'rb') as f:
+        return f.read()
+
+
+def measure(func: Callable[[], Any], min_time: float) -> Dict[str, float]:
+    """Time func and sample the memory one call allocates."""
+    func()  # warm up
+
+    # Grow the batch size until one batch takes a measurable amount of time
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= 0.05 or number >= 1 << 20:
+            break
+        number *= 2
+
+    total_calls = 0
+    total_time = 0.0
+    while total_time < min_time:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        total_time += time.perf_counter() - start
+        total_calls += number
+
+    # Memory is measured separately: tracing slows every allocation down
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    result = func()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    return {
+        'ops_per_sec': total_calls / total_time,
+        'mean_us': total_time / total_calls * 1e6,
+        'alloc_kib': (peak - baseline) / 1024,
+        'retained_kib': (current - baseline) / 1024
+    }
+
+
+def build_benchmarks(engines: List[str]) -> List[tuple]:
+    benchmarks = []
+
+    profile_pages = sorted(glob.glob(os.path.join(FIXTURES_DIR, 'profile_*.html')))
+    homepage = load_fixture('homepage.html')
+
+    for engine in engines:
+        for path in profile_pages:
+            page = os.path.basename(path)[:-len('.html')]
+            content = load_fixture(os.path.basename(path))
+            document = parse_html(content, engine)
+
+            benchmarks.append((f"parse_html[{engine}] {page}", lambda c=content, e=engine: parse_html(c, e)))
+            benchmarks.append((f"parse_player_profile[{engine}] {page}",
+                               lambda d=document: parse_player_profile(d)))
+
+        document = parse_html(homepage, engine)
+        benchmarks.append((f"parse_html[{engine}] homepage", lambda e=engine: parse_html(homepage, e)))
+        benchmarks.append((f"parse_leaderboard[{engine}] homepage", lambda d=document: parse_leaderboard(d)))
+
+    for text in TRANSLATION_SAMPLES:
+        benchmarks.append((f"translate_russian_to_english {text!r}", lambda t=text: translate_russian_to_english(t)))
+
+    benchmarks.append(("get_rank_progress x%d" % len(XP_SAMPLES),
+                       lambda: [get_rank_progress(xp) for xp in XP_SAMPLES]))
+
+    # Batch rank resolution over every XP value on the homepage leaderboards
+    leaderboard_xp = [player['value'] for players in parse_leaderboard(parse_html(homepage, engines[-1])).values()
+                      for player in players]
+    benchmarks.append(("get_ranks_from_xp x%d" % len(leaderboard_xp), lambda: get_ranks_from_xp(leaderboard_xp)))
+
+    benchmarks.extend(build_embed_benchmarks(homepage, engines[-1]))
+    return benchmarks
+
+
+def build_embed_benchmarks(homepage: bytes, engine: str) -> List[tuple]:
+    """Embed builders from discord_bot.py, skipped when discord.py is missing.
+
+    Each builder is measured on its own (__wrapped__) and as the bot calls it:
+    timed, and for leaderboards through the render cache.
+    """
+    try:
+        from discord_bot import create_player_embed, create_leaderboard_embed
+    except ImportError as e:
+        print(f"Skipping embed benchmarks: {e}")
+        return []
+
+    benchmarks = []
+
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, 'profile_*.json'))):
+        with open(path, encoding='utf-8') as f:
+            player_data = json.load(f)
+        if player_data:
+            page = os.path.basename(path)[:-len('.json')]
+            benchmarks.append((f"create_player_embed {page}",
+                               lambda p=player_data: create_player_embed.__wrapped__(p)))
+            benchmarks.append((f"create_player_embed (timed) {page}", lambda p=player_data: create_player_embed(p)))
+
+    scraper = RTanksScraper()
+    snapshot = {'categories': compact_leaderboard(parse_leaderboard(parse_html(homepage, engine)))}
+    for category in snapshot['categories']:
+        page_data = scraper.paginate_leaderboard(snapshot, category, 1)
+        benchmarks.append((f"create_leaderboard_embed {category} p1",
+                           lambda d=page_data: create_leaderboard_embed.__wrapped__(d)))
+        benchmarks.append((f"create_leaderboard_embed (cached) {category} p1",
+                           lambda d=page_data: create_leaderboard_embed(d)))
+
+    return benchmarks
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-k', dest='keyword', help="only run benchmarks whose name contains this")
+    parser.add_argument('--engine', action='append', help="HTML engine(s) to benchmark (default: all installed)")
+    parser.add_argument('--min-time', type=float, default=0.5, help="seconds to run each benchmark")
+    parser.add_argument('--json', dest='json_path', help="write results to this file")
+    args = parser.parse_args()
+
+    engines = args.engine or available_engines()
+    benchmarks = build_benchmarks(engines)
+    if args.keyword:
+        benchmarks = [(name, func) for name, func in benchmarks if args.keyword in name]
+
+    print(f"{'benchmark':<72} {'ops/sec':>11} {'mean µs':>10} {'alloc KiB':>10} {'retained KiB':>13}")
+    results = {}
+    for name, func in benchmarks:
+        stats = measure(func, args.min_time)
+        results[name] = stats
+        print(f"{name:<72} {stats['ops_per_sec']:>11,.0f} {stats['mean_us']:>10.1f} "
+              f"{stats['alloc_kib']:>10.1f} {stats['retained_kib']:>13.1f}")
+
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        peak_rss //= 1024
+    print(f"\npeak RSS: {peak_rss / 1024:.1f} MiB")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({'results': results, 'peak_rss_kib': peak_rss}, f, indent=2)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
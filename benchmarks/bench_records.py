@@ -0,0 +1,106 @@
+"""
+Memory held by cached records: parser dicts vs the compact records in records.py.
+
+Builds 10,000 leaderboard rows and 10,000 profiles from the saved fixtures,
+once as the dicts the parsers return and once as records, and reports the
+memory each set keeps alive. Every copy is decoded from JSON separately, so
+like pages parsed at different times they share no string objects until
+the records intern them. Conversion times are printed too, since the
+profile cache converts a record back to a dict on every hit.
+
+Run from the repository root:
+
+    python benchmarks/bench_records.py
+    python benchmarks/bench_records.py --count 50000
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import RTANKS_USER_URL
+from records import LeaderboardRow, PlayerProfile
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def load_samples():
+    """Leaderboard rows and profiles from the fixtures, as JSON strings."""
+    with open(os.path.join(FIXTURES_DIR, 'homepage.json'), encoding='utf-8') as f:
+        categories = json.load(f)
+    rows = [json.dumps(row, ensure_ascii=False) for players in categories.values() for row in players]
+
+    profiles = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, 'profile_*.json'))):
+        with open(path, encoding='utf-8') as f:
+            profile = json.load(f)
+        if profile:
+            profile['username'] = profile['name']
+            profile['profile_url'] = f"{RTANKS_USER_URL}/{profile['name']}"
+            profiles.append(json.dumps(profile, ensure_ascii=False))
+    return rows, profiles
+
+
+def build(samples: List[str], count: int, convert: Callable[[dict], Any]) -> List[Any]:
+    items = []
+    for i in range(count):
+        data = json.loads(samples[i % len(samples)])
+        data['name'] = f"{data['name']}_{i}"  # every cached player has their own name
+        items.append(convert(data))
+    return items
+
+
+def retained(factory: Callable[[], List[Any]]) -> int:
+    """Bytes still allocated once factory's result is built."""
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    items = factory()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    return current - baseline
+
+
+def per_call_us(func: Callable[[], Any], number: int = 20000) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return (time.perf_counter() - start) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=10000, help='records per set (default 10000)')
+    args = parser.parse_args()
+
+    rows, profiles = load_samples()
+    kinds = [
+        ('leaderboard rows', rows, LeaderboardRow),
+        ('profiles', profiles, PlayerProfile)
+    ]
+
+    print(f"{'records':<18}{'dicts KiB':>12}{'records KiB':>14}{'saved KiB':>12}{'saved':>8}"
+          f"{'from_dict us':>14}{'to_dict us':>12}")
+    for label, samples, record_type in kinds:
+        as_dicts = retained(lambda: build(samples, args.count, lambda d: d))
+        as_records = retained(lambda: build(samples, args.count, record_type.from_dict))
+
+        sample = json.loads(samples[0])
+        record = record_type.from_dict(sample)
+        assert record.to_dict() == sample, f"{record_type.__name__} does not round-trip"
+
+        saved = as_dicts - as_records
+        print(f"{label:<18}{as_dicts / 1024:>12.0f}{as_records / 1024:>14.0f}{saved / 1024:>12.0f}"
+              f"{saved / as_dicts:>8.0%}{per_call_us(lambda: record_type.from_dict(sample)):>14.2f}"
+              f"{per_call_us(record.to_dict):>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Check the page parsers against the saved RTanks pages in fixtures/.
+
+Each fixtures/<page>.html has a fixtures/<page>.json holding the parsed
+result it must produce with every installed HTML engine. Run from the
+repository root:
+
+    python benchmarks/verify_fixtures.py           # compare
+    python benchmarks/verify_fixtures.py --update  # rewrite the .json files
+"""
+
+import glob
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from html_engines import available_engines, parse_html
+from parsers import parse_leaderboard, parse_player_profile
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def parse_fixture(html_path: str, engine: str):
+    with open(html_path, 'rb') as f:
+        document = parse_html(f.read(), engine)
+
+    if os.path.basename(html_path).startswith('profile_'):
+        return parse_player_profile(document)
+    return parse_leaderboard(document)
+
+
+def main() -> int:
+    update = '--update' in sys.argv
+    engines = available_engines()
+    failures = 0
+
+    print(f"engines: {', '.join(engines)}")
+
+    for html_path in sorted(glob.glob(os.path.join(FIXTURES_DIR, '*.html'))):
+        expected_path = html_path[:-len('.html')] + '.json'
+
+        if update:
+            # The reference output always comes from BeautifulSoup's html.parser
+            result = parse_fixture(html_path, 'html.parser')
+            with open(expected_path, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False, indent=2, sort_keys=True)
+                f.write('\n')
+            print(f"updated  {os.path.basename(expected_path)}")
+            continue
+
+        with open(expected_path, encoding='utf-8') as f:
+            expected = json.load(f)
+
+        for engine in engines:
+            result = parse_fixture(html_path, engine)
+            if result == expected:
+                print(f"ok       {os.path.basename(html_path)} [{engine}]")
+            else:
+                failures += 1
+                print(f"MISMATCH {os.path.basename(html_path)} [{engine}]")
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
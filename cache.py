@@ -0,0 +1,139 @@
+"""
+In-memory caches used by the RTanks scraper.
+"""
+
+import asyncio
+import hashlib
+import pickle
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+# Lookup states returned by TTLCache.lookup
+FRESH = "fresh"
+STALE = "stale"
+
+
+def content_key(data: Any) -> bytes:
+    """Hash of picklable data, for caches keyed by content rather than identity.
+
+    Pickling is much faster than sorted JSON. Equal data built in a
+    different dict order hashes differently, which only costs a cache miss.
+    """
+    encoded = pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+    return hashlib.blake2b(encoded, digest_size=16).digest()
+
+
+class TTLCache:
+    """LRU cache with a freshness TTL and a stale-while-revalidate window.
+
+    Entries younger than ``ttl`` are fresh. Entries older than that but
+    within ``ttl + stale_ttl`` are still returned, flagged as stale so the
+    caller can refresh them in the background. Anything older is a miss.
+    """
+
+    def __init__(self, max_size: int, ttl: float, stale_ttl: float = 0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, key: Hashable) -> Tuple[Optional[Any], Optional[str]]:
+        """Return (value, FRESH/STALE) for a cached key, or (None, None) on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None, None
+
+        value, stored_at = entry
+        age = time.monotonic() - stored_at
+
+        if age < self.ttl:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value, FRESH
+
+        if age < self.ttl + self.stale_ttl:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.stale_hits += 1
+            return value, STALE
+
+        # Too old to serve at all
+        del self._entries[key]
+        self.misses += 1
+        return None, None
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return a fresh or stale value, or None."""
+        return self.lookup(key)[0]
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entries if full."""
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for tuning the cache size and TTLs."""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': self.hits / lookups if lookups else 0.0
+        }
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one in-flight task.
+
+    The first caller starts the work; callers arriving while it runs await
+    the same task and receive its result or exception. Nothing is kept once
+    the task finishes, so failures are never cached.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+
+        # Shield so one cancelled waiter does not cancel the shared work
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'in_flight': len(self._inflight),
+            'coalesced': self.coalesced
+        }
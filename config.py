@@ -72,5 +72,88 @@ LEADERBOARD_CATEGORIES = {
 # Request configuration
 REQUEST_TIMEOUT = 10
 REQUEST_HEADERS = {
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Encoding': 'gzip, deflate'  # Both transports decompress these natively
 }
+
+# HTTP transport configuration
+HTTP_BACKEND = "aiohttp"  # "aiohttp" (pooled asyncio client) or "requests" (thread pool fallback)
+HTTP_POOL_LIMIT = 20  # Max simultaneous connections in total
+HTTP_POOL_LIMIT_PER_HOST = 10  # Max simultaneous connections to the ratings site
+HTTP_KEEPALIVE_TIMEOUT = 30  # Seconds an idle keep-alive connection stays in the pool
+
+# Profile cache configuration
+PROFILE_CACHE_SIZE = 1000  # Max cached profiles before least recently used are evicted
+PROFILE_CACHE_TTL = 120  # Seconds a cached profile is served without refreshing
+PROFILE_CACHE_STALE_TTL = 600  # Extra seconds a stale profile is served while refreshing in the background
+
+# Leaderboard snapshot configuration
+LEADERBOARD_REFRESH_INTERVAL = 300  # Seconds before the homepage leaderboards are refetched
+LEADERBOARD_PAGE_SIZE = 10  # Players shown per leaderboard page
+LEADERBOARD_SIZE = 100  # Players the homepage lists per category
+
+# HTML parser engine: "auto" (fastest installed), "selectolax", "lxml" or "html.parser"
+HTML_PARSER = "auto"
+
+# Background leaderboard prefetch configuration
+LEADERBOARD_PREFETCH_INTERVAL = 240  # Seconds between background refreshes (below LEADERBOARD_REFRESH_INTERVAL)
+LEADERBOARD_PREFETCH_JITTER = 30  # Random +/- seconds added to each refresh delay
+LEADERBOARD_PREFETCH_RETRY_DELAY = 30  # First retry after a failed refresh; doubles with every further failure
+LEADERBOARD_PREFETCH_MAX_BACKOFF = 1800  # Longest delay between retries while the site is failing
+
+# Snapshot store configuration (SQLite)
+STORE_PATH = "rtanks_snapshots.db"
+STORE_FLUSH_INTERVAL = 2.0  # Seconds pending writes are batched before hitting the disk
+STORE_BATCH_SIZE = 200  # Flush early once this many writes are pending
+STORE_RETENTION_DAYS = 90  # Snapshots older than this are deleted
+STORE_COMPACT_AFTER_DAYS = 7  # Older history is thinned to one snapshot per player (or leaderboard) per day
+STORE_COMPACT_INTERVAL = 6 * 3600  # Seconds between retention/compaction runs
+
+# Upstream governor configuration (rate limit, adaptive concurrency, retries, circuit breaker)
+HTTP_RATE_LIMIT = 5.0  # Average requests per second sent to the ratings site
+HTTP_RATE_BURST = 10  # Requests allowed back to back before the rate limit applies
+HTTP_CONCURRENCY_INITIAL = 4  # Starting number of simultaneous requests
+HTTP_CONCURRENCY_MIN = 1  # Floor for the adaptive concurrency limit
+HTTP_CONCURRENCY_MAX = HTTP_POOL_LIMIT_PER_HOST  # Ceiling for the adaptive concurrency limit
+HTTP_TARGET_LATENCY = 2.0  # Seconds; slower responses shrink the concurrency limit
+HTTP_LIMIT_DECREASE = 0.7  # Factor the concurrency limit is multiplied by on a slow or failed request
+HTTP_MAX_RETRIES = 2  # Retries after a 429/5xx response or a connection error (not a timeout)
+HTTP_RETRY_BASE_DELAY = 0.5  # Seconds; retry n waits a random time up to base * 2**n
+HTTP_RETRY_MAX_DELAY = 8.0  # Longest wait between retries (also caps Retry-After)
+HTTP_REQUEST_DEADLINE = REQUEST_TIMEOUT  # Seconds for one request including every retry
+CIRCUIT_FAILURE_THRESHOLD = 5  # Consecutive failures before requests fail fast
+CIRCUIT_RESET_TIMEOUT = 30  # Seconds the circuit stays open before a trial request
+
+# Page revalidation (conditional GET and body hashing)
+PAGE_CACHE_SIZE = 2000  # Pages whose validators, body hash and parsed result are kept
+PAGE_CACHE_TTL = 3600  # Seconds a parsed page may be reused when the site says it is unchanged
+
+# Rendered embed cache
+EMBED_CACHE_SIZE = 512  # Leaderboard embeds kept, keyed by a hash of their data
+EMBED_CACHE_TTL = 3600  # Seconds an unused rendered embed is kept
+
+# /compare configuration
+COMPARE_MAX_PLAYERS = 10  # Most usernames one /compare accepts
+COMPARE_CONCURRENCY = 4  # Profiles fetched at the same time
+COMPARE_DEADLINE = 12.0  # Seconds for all lookups; players still loading are reported as timed out
+
+# Keep-alive / health server (runs on the bot's event loop)
+KEEP_ALIVE_HOST = "0.0.0.0"
+KEEP_ALIVE_PORT = 8080
+HEALTH_LAG_INTERVAL = 1.0  # Seconds between event-loop lag probes
+HEALTH_MAX_LOOP_LAG = 1.0  # Seconds of loop lag above which /health reports unhealthy
+HEALTH_MAX_SCRAPE_AGE = 900  # Seconds without a successful scrape before /health reports degraded
+
+# HTML parse worker pool
+PARSE_POOL_MODE = "thread"  # "thread", "process" (sidesteps the GIL) or "inline" (on the event loop)
+PARSE_POOL_WORKERS = 2  # Worker threads or processes
+PARSE_POOL_MAX_PENDING = 16  # Parses queued or running before callers wait for a slot
+
+# Slash command sync
+COMMAND_TREE_HASH_PATH = ".command_tree_hash"  # Hash of the last synced command tree; delete to force a sync
+
+# Username autocomplete
+AUTOCOMPLETE_LIMIT = 25  # Suggestions per keystroke (Discord shows at most 25)
+
+# Player name suggestions
+SUGGESTION_LIMIT = 5  # "Did you mean" names shown when a player is not found
@@ -2,10 +2,21 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import asyncio
-from typing import Optional, Dict, Any
+import functools
+import hashlib
+import json
+import time
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List
 from rtanks_scraper import RTanksScraper
+from prefetch import LeaderboardPrefetcher
+from storage import SnapshotStore
+from cache import TTLCache, content_key
+from metrics import (COMMAND_SECONDS, RENDER_SECONDS, GATEWAY_LATENCY, CACHE_HIT_RATIO,
+                     EXECUTOR_QUEUE_DEPTH, executor_queue_depth)
 from config import *
 from utils import *
+import startup
 
 class RTanksBot(commands.Bot):
     def __init__(self):
@@ -18,7 +29,9 @@ class RTanksBot(commands.Bot):
             help_command=None
         )
 
-        self.scraper = RTanksScraper()
+        self.store = SnapshotStore()
+        self.scraper = RTanksScraper(store=self.store)
+        self.leaderboard_prefetcher = LeaderboardPrefetcher(self.scraper, create_leaderboard_embed)
 
     
     async def setup_hook(self):
@@ -26,18 +39,85 @@ class RTanksBot(commands.Bot):
         # Register slash commands
         await self.add_cog(RTanksCog(self))
         
-        # Sync commands on startup
+        # Leaderboard buttons and selects carry their state in custom_id; listen for them on every message
+        self.add_dynamic_items(LeaderboardPageButton, LeaderboardCategorySelect, LeaderboardPageSelect)
+        
+        self._register_metrics()
+        
+        # Keep leaderboard pages warm in the background
+        self.store.start()
+        self.leaderboard_prefetcher.start()
+        
+        # Sync commands on startup, if they changed
+        await self.sync_commands()
+        
+        startup.mark("setup_hook")
+    
+    async def sync_commands(self):
+        """Sync the slash commands with Discord when they differ from the last sync.
+        
+        Global syncs are slow and rate limited, so a hash of the command tree
+        is kept in COMMAND_TREE_HASH_PATH. Delete that file to force a sync.
+        """
+        payload = [command.to_dict(self.tree) for command in self.tree.get_commands()]
+        encoded = json.dumps([self.application_id, payload], sort_keys=True, default=str).encode()
+        digest = hashlib.sha256(encoded).hexdigest()
+        
+        try:
+            with open(COMMAND_TREE_HASH_PATH, encoding='utf-8') as f:
+                if f.read().strip() == digest:
+                    print("Command tree unchanged, skipping sync")
+                    return
+        except OSError:
+            pass
+        
         try:
             synced = await self.tree.sync()
             print(f"Synced {len(synced)} command(s)")
         except Exception as e:
             print(f"Failed to sync commands: {e}")
+            return
+        
+        try:
+            with open(COMMAND_TREE_HASH_PATH, 'w', encoding='utf-8') as f:
+                f.write(digest)
+        except OSError as e:
+            print(f"Could not save command tree hash: {e}")
+    
+    def _register_metrics(self):
+        """Point the /metrics gauges at live bot state; they are read only when scraped."""
+        loop = asyncio.get_running_loop()
+        
+        GATEWAY_LATENCY.set_function(lambda: self.latency)
+        CACHE_HIT_RATIO.set_function(lambda: {
+            ('profile',): self.scraper.profile_cache.stats()['hit_ratio'],
+            ('page',): self.scraper.page_cache.stats()['hit_ratio'],
+            ('embed',): _embed_cache.stats()['hit_ratio']
+        })
+        EXECUTOR_QUEUE_DEPTH.set_function(lambda: {
+            # The default executor runs requests-backend HTTP calls
+            ('default',): executor_queue_depth(getattr(loop, '_default_executor', None)),
+            ('store',): self.store.queue_depth(),
+            ('parse',): self.scraper.parse_pool.queue_depth()
+        })
+    
+    async def close(self):
+        """Stop background work, flush the snapshot store and close the HTTP pool before shutting down."""
+        await self.leaderboard_prefetcher.stop()
+        await self.store.close()
+        await self.scraper.close()
+        await super().close()
     
     async def on_ready(self):
         """Called when bot is ready."""
         print(f'{self.user} has connected to Discord!')
         print(f'Bot is in {len(self.guilds)} guilds')
         
+        # on_ready fires again after reconnects; only the first one ends startup
+        if not startup.is_marked("ready"):
+            startup.mark("ready")
+            print(startup.report())
+        
         # Set bot status
         await self.change_presence(
             activity=discord.Activity(
@@ -54,6 +134,7 @@ class RTanksCog(commands.Cog):
     @app_commands.describe(username="The RTanks player username to lookup")
     async def player_command(self, interaction: discord.Interaction, username: str):
         """Get player profile from RTanks."""
+        start = time.perf_counter()
         await interaction.response.defer()
         
         try:
@@ -70,8 +151,10 @@ class RTanksCog(commands.Cog):
             player_data = await self.bot.scraper.get_player_profile(username)
             
             if not player_data:
+                # Suggest close matches from names we already know, without another request
+                suggestions = self.bot.scraper.suggest_player_names(username)
                 await interaction.followup.send(
-                    embed=create_error_embed(f"Player '{username}' not found or profile could not be accessed.")
+                    embed=create_not_found_embed(username, suggestions)
                 )
                 return
             
@@ -85,7 +168,53 @@ class RTanksCog(commands.Cog):
             await interaction.followup.send(
                 embed=create_error_embed("An error occurred while fetching player data.")
             )
+        finally:
+            COMMAND_SECONDS.observe(time.perf_counter() - start, 'player')
 
+    @app_commands.command(name="standing", description="Show where a player stands on every leaderboard")
+    @app_commands.describe(username="The RTanks player username to lookup")
+    async def standing_command(self, interaction: discord.Interaction, username: str):
+        """Show a player's leaderboard positions from the cached homepage."""
+        start = time.perf_counter()
+        await interaction.response.defer()
+        
+        try:
+            username = username.strip()
+            
+            if not username:
+                await interaction.followup.send(
+                    embed=create_error_embed("Please provide a valid username.")
+                )
+                return
+            
+            # Answered from the leaderboard snapshot; the profile page is never fetched
+            standing = await self.bot.scraper.get_player_standing(username)
+            
+            if standing is None:
+                await interaction.followup.send(
+                    embed=create_error_embed("Could not fetch leaderboard data.")
+                )
+                return
+            
+            await interaction.followup.send(embed=create_standing_embed(standing))
+            
+        except Exception as e:
+            print(f"Error in standing command: {e}")
+            await interaction.followup.send(
+                embed=create_error_embed("An error occurred while fetching leaderboard data.")
+            )
+        finally:
+            COMMAND_SECONDS.observe(time.perf_counter() - start, 'standing')
+    
+    @standing_command.autocomplete('username')
+    @player_command.autocomplete('username')
+    async def username_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        """Suggest known player names while the username is typed."""
+        return [
+            app_commands.Choice(name=name, value=name)
+            for name in self.bot.scraper.name_index.search(current, AUTOCOMPLETE_LIMIT)
+        ]
+    
     @app_commands.command(name="leaderboard", description="Get RTanks leaderboard")
     @app_commands.describe(category="Leaderboard category to display")
     @app_commands.choices(category=[
@@ -96,11 +225,12 @@ class RTanksCog(commands.Cog):
     ])
     async def leaderboard_command(self, interaction: discord.Interaction, category: str = "experience"):
         """Get RTanks leaderboard with pagination."""
+        start = time.perf_counter()
         await interaction.response.defer()
         
         try:
-            # Get leaderboard data
-            leaderboard_data = await self.bot.scraper.get_leaderboard(category, page=1)
+            # Get leaderboard data and its pre-built embed
+            leaderboard_data, embed = await self.bot.leaderboard_prefetcher.get_page(category, 1)
             
             if not leaderboard_data:
                 await interaction.followup.send(
@@ -108,11 +238,8 @@ class RTanksCog(commands.Cog):
                 )
                 return
             
-            # Create leaderboard embed
-            embed = create_leaderboard_embed(leaderboard_data)
-            
             # Create pagination view
-            view = LeaderboardView(self.bot.scraper, leaderboard_data)
+            view = LeaderboardView(leaderboard_data)
             
             await interaction.followup.send(embed=embed, view=view)
             
@@ -121,103 +248,227 @@ class RTanksCog(commands.Cog):
             await interaction.followup.send(
                 embed=create_error_embed("An error occurred while fetching leaderboard data.")
             )
+        finally:
+            COMMAND_SECONDS.observe(time.perf_counter() - start, 'leaderboard')
 
-# Create bot instance
-bot = RTanksBot()
-
-
-
-class LeaderboardView(discord.ui.View):
-    """View for leaderboard pagination."""
-    
-    def __init__(self, scraper: RTanksScraper, initial_data: Dict[str, Any]):
-        super().__init__(timeout=300)  # 5 minute timeout
-        self.scraper = scraper
-        self.current_data = initial_data
-    
-    @discord.ui.button(label="<", style=discord.ButtonStyle.primary, disabled=True)
-    async def previous_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        """Previous page button."""
+    @app_commands.command(name="compare", description="Compare several RTanks players")
+    @app_commands.describe(usernames=f"Up to {COMPARE_MAX_PLAYERS} usernames, separated by spaces or commas")
+    async def compare_command(self, interaction: discord.Interaction, usernames: str):
+        """Compare the stats of several players side by side."""
+        start = time.perf_counter()
         await interaction.response.defer()
         
         try:
-            current_page = self.current_data['page']
+            names = parse_username_list(usernames)
             
-            if current_page <= 1:
-                await interaction.followup.send("Already on the first page!", ephemeral=True)
+            if len(names) < 2:
+                await interaction.followup.send(
+                    embed=create_error_embed("Please provide at least two usernames to compare.")
+                )
                 return
             
-            # Get previous page
-            new_data = await self.scraper.get_leaderboard(
-                self.current_data['category'], 
-                page=current_page - 1
-            )
-            
-            if not new_data:
-                await interaction.followup.send("Error fetching previous page.", ephemeral=True)
+            if len(names) > COMPARE_MAX_PLAYERS:
+                await interaction.followup.send(
+                    embed=create_error_embed(f"You can compare at most {COMPARE_MAX_PLAYERS} players at once.")
+                )
                 return
             
-            self.current_data = new_data
+            # Fetch every profile concurrently; slow ones are dropped at the deadline
+            profiles = await self.bot.scraper.get_player_profiles(names)
             
-            # Update embed
-            embed = create_leaderboard_embed(new_data)
+            embed = create_compare_embed(names, profiles)
             
-            # Update button states
-            self.update_button_states()
-            
-            await interaction.edit_original_response(embed=embed, view=self)
+            await interaction.followup.send(embed=embed)
             
         except Exception as e:
-            print(f"Error in previous button: {e}")
-            await interaction.followup.send("An error occurred.", ephemeral=True)
+            print(f"Error in compare command: {e}")
+            await interaction.followup.send(
+                embed=create_error_embed("An error occurred while comparing players.")
+            )
+        finally:
+            COMMAND_SECONDS.observe(time.perf_counter() - start, 'compare')
+
+class LeaderboardPageButton(discord.ui.DynamicItem[discord.ui.Button],
+                            template=r'leaderboard:(?P<category>[a-z]+):(?P<page>[0-9]+):(?P<direction>prev|next)'):
+    """The "<" or ">" button of a leaderboard message.
+    
+    Category, page on display and direction live in the custom_id, so a
+    press is answered from the leaderboard snapshot alone. Nothing is kept
+    per message, and buttons on messages posted before a restart still work.
+    """
+    
+    def __init__(self, category: str, page: int, direction: str, disabled: bool = False):
+        super().__init__(
+            discord.ui.Button(
+                label="<" if direction == "prev" else ">",
+                style=discord.ButtonStyle.primary,
+                disabled=disabled,
+                custom_id=f"leaderboard:{category}:{page}:{direction}"
+            )
+        )
+        self.category = category
+        self.page = page
+        self.direction = direction
     
-    @discord.ui.button(label=">", style=discord.ButtonStyle.primary)
-    async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        """Next page button."""
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match['category'], int(match['page']), match['direction'])
+    
+    async def callback(self, interaction: discord.Interaction):
+        """Show the previous or next page."""
         await interaction.response.defer()
         
         try:
-            current_page = self.current_data['page']
-            
-            if not self.current_data['has_next']:
-                await interaction.followup.send("No more pages available!", ephemeral=True)
-                return
-            
-            # Get next page
-            new_data = await self.scraper.get_leaderboard(
-                self.current_data['category'], 
-                page=current_page + 1
-            )
-            
-            if not new_data:
-                await interaction.followup.send("Error fetching next page.", ephemeral=True)
+            if self.direction == "prev" and self.page <= 1:
+                await interaction.followup.send("Already on the first page!", ephemeral=True)
                 return
             
-            self.current_data = new_data
-            
-            # Update embed
-            embed = create_leaderboard_embed(new_data)
-            
-            # Update button states
-            self.update_button_states()
-            
-            await interaction.edit_original_response(embed=embed, view=self)
+            target_page = self.page - 1 if self.direction == "prev" else self.page + 1
+            await show_leaderboard_page(interaction, self.category, target_page)
             
         except Exception as e:
-            print(f"Error in next button: {e}")
+            print(f"Error in leaderboard {self.direction} button: {e}")
             await interaction.followup.send("An error occurred.", ephemeral=True)
+
+class LeaderboardCategorySelect(discord.ui.DynamicItem[discord.ui.Select], template=r'leaderboard:category'):
+    """Switches a leaderboard message to page 1 of another category."""
+    
+    def __init__(self, current: Optional[str] = None):
+        options = [
+            discord.SelectOption(label=info['name'], value=category, description=info['description'],
+                                 default=category == current)
+            for category, info in LEADERBOARD_CATEGORIES.items()
+        ]
+        super().__init__(
+            discord.ui.Select(placeholder="Category", options=options, custom_id="leaderboard:category", row=1)
+        )
+    
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Select, match):
+        return cls()
+    
+    async def callback(self, interaction: discord.Interaction):
+        """Show the first page of the chosen category."""
+        await interaction.response.defer()
+        
+        try:
+            await show_leaderboard_page(interaction, self.item.values[0], 1)
+        except Exception as e:
+            print(f"Error in leaderboard category select: {e}")
+            await interaction.followup.send("An error occurred.", ephemeral=True)
+
+class LeaderboardPageSelect(discord.ui.DynamicItem[discord.ui.Select],
+                            template=r'leaderboard:(?P<category>[a-z]+):jump'):
+    """Jumps straight to any page of the category on display."""
+    
+    def __init__(self, category: str, page: int = 1, total_pages: int = 1, total_players: int = 0):
+        # Discord allows at most 25 options; show the 25 pages around the current one
+        first = max(1, min(page - 12, total_pages - 24))
+        last = min(total_pages, first + 24)
+        options = [
+            discord.SelectOption(
+                label=f"Page {number}",
+                value=str(number),
+                description=f"#{(number - 1) * LEADERBOARD_PAGE_SIZE + 1}-{min(number * LEADERBOARD_PAGE_SIZE, total_players)}",
+                default=number == page
+            )
+            for number in range(first, last + 1)
+        ] or [discord.SelectOption(label="Page 1", value="1", default=True)]
+        super().__init__(
+            discord.ui.Select(placeholder="Jump to page", options=options, custom_id=f"leaderboard:{category}:jump",
+                              disabled=total_pages <= 1, row=2)
+        )
+        self.category = category
+    
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Select, match):
+        # The options only matter when the message is rendered; the choice arrives in the interaction
+        return cls(match['category'])
+    
+    async def callback(self, interaction: discord.Interaction):
+        """Show the chosen page."""
+        await interaction.response.defer()
+        
+        try:
+            await show_leaderboard_page(interaction, self.category, int(self.item.values[0]))
+        except Exception as e:
+            print(f"Error in leaderboard page select: {e}")
+            await interaction.followup.send("An error occurred.", ephemeral=True)
+
+async def show_leaderboard_page(interaction: discord.Interaction, category: str, page: int):
+    """Edit a deferred leaderboard interaction's message to show one page.
+    
+    Every category and page is rendered from the same prefetched snapshot,
+    so no interaction waits on the ratings site.
+    """
+    if category not in LEADERBOARD_CATEGORIES:
+        await interaction.followup.send("This leaderboard is no longer available.", ephemeral=True)
+        return
+    
+    page_data, embed = await interaction.client.leaderboard_prefetcher.get_page(category, page)
+    
+    if not page_data:
+        await interaction.followup.send("Error fetching leaderboard page.", ephemeral=True)
+        return
+    
+    if not page_data['players']:
+        await interaction.followup.send("No more pages available!", ephemeral=True)
+        return
+    
+    await interaction.edit_original_response(embed=embed, view=LeaderboardView(page_data))
+
+class LeaderboardView(discord.ui.View):
+    """Navigation for one leaderboard page: "<"/">" buttons, a category select and a page select.
+    
+    Made of dynamic items only and without a timeout, so discord.py does
+    not keep the view once the message is sent; interactions are
+    dispatched through the dynamic items registered in setup_hook.
+    """
+    
+    def __init__(self, page_data: Dict[str, Any]):
+        super().__init__(timeout=None)
+        category = page_data['category']
+        page = page_data['page']
+        self.add_item(LeaderboardPageButton(category, page, "prev", disabled=not page_data['has_previous']))
+        self.add_item(LeaderboardPageButton(category, page, "next", disabled=not page_data['has_next']))
+        self.add_item(LeaderboardCategorySelect(category))
+        self.add_item(LeaderboardPageSelect(category, page, page_data['total_pages'], page_data['total_players']))
+
+# Rendered embeds keyed by builder and content hash of the input data
+_embed_cache = TTLCache(EMBED_CACHE_SIZE, EMBED_CACHE_TTL)
+
+def timed_embed(builder):
+    """Record how long the builder takes in RENDER_SECONDS."""
+    label = builder.__name__[len('create_'):-len('_embed')]  # "player", "leaderboard"
+    
+    @functools.wraps(builder)
+    def wrapper(data: Dict[str, Any]) -> discord.Embed:
+        with RENDER_SECONDS.time(label):
+            return builder(data)
+    return wrapper
+
+def memoized_embed(builder):
+    """Reuse the built embed whenever the builder sees identical data again.
     
-    def update_button_states(self):
-        """Update button enabled/disabled states."""
-        self.previous_button.disabled = not self.current_data['has_previous']
-        self.next_button.disabled = not self.current_data['has_next']
+    The same Embed object is handed to every caller (as the leaderboard
+    prefetcher already does), so treat returned embeds as read-only.
+    Only worth it where hashing the data is cheaper than building the
+    embed; profiles are nested enough that it is not.
+    """
+    label = builder.__name__[len('create_'):-len('_embed')]  # "player", "leaderboard"
     
-    async def on_timeout(self):
-        """Called when view times out."""
-        # Disable all buttons
-        for item in self.children:
-            item.disabled = True
+    @functools.wraps(builder)
+    def wrapper(data: Dict[str, Any]) -> discord.Embed:
+        with RENDER_SECONDS.time(label):
+            key = (builder.__name__, content_key(data))
+            embed = _embed_cache.get(key)
+            if embed is None:
+                embed = builder(data)
+                _embed_cache.set(key, embed)
+            return embed
+    return wrapper
 
+@timed_embed
 def create_player_embed(player_data: Dict[str, Any]) -> discord.Embed:
     """Create Discord embed for player profile."""
     name = player_data.get('name', 'Unknown')
@@ -274,31 +525,41 @@ def create_player_embed(player_data: Dict[str, Any]) -> discord.Embed:
     # Add equipment info
     equipment = player_data.get('equipment', {})
     if equipment:
-        equipment_text = ""
+        equipment_lines = []
         
         if equipment.get('turret'):
-            equipment_text += f"**Turret:** {equipment['turret']}\n"
+            equipment_lines.append(f"**Turret:** {equipment['turret']}")
         
         if equipment.get('hull'):
-            equipment_text += f"**Hull:** {equipment['hull']}\n"
+            equipment_lines.append(f"**Hull:** {equipment['hull']}")
         
         if equipment.get('paint'):
-            equipment_text += f"**Paint:** {equipment['paint']}\n"
+            equipment_lines.append(f"**Paint:** {equipment['paint']}")
         
         if equipment.get('resistances'):
-            equipment_text += f"**Resistances:** {', '.join(equipment['resistances'])}\n"
+            equipment_lines.append(f"**Resistances:** {', '.join(equipment['resistances'])}")
         
-        if equipment_text:
+        if equipment_lines:
             embed.add_field(
                 name="Equipment",
-                value=equipment_text.strip(),
+                value="\n".join(equipment_lines).strip(),
                 inline=False
             )
     
     # Leaderboard positions removed as requested by user
     
+    # Profiles loaded from the snapshot store carry the time they were scraped
+    cached_at = player_data.get('cached_at')
+    if cached_at:
+        embed.set_footer(text="⚠️ Ratings site unavailable, showing saved profile from")
+        embed.timestamp = datetime.fromtimestamp(cached_at, timezone.utc)
+    
     return embed
 
+# Medals shown in front of the top three positions
+PODIUM_MEDALS = {1: "🥇", 2: "🥈", 3: "🥉"}
+
+@memoized_embed
 def create_leaderboard_embed(leaderboard_data: Dict[str, Any]) -> discord.Embed:
     """Create Discord embed for leaderboard."""
     category = leaderboard_data.get('category', 'experience')
@@ -318,30 +579,26 @@ def create_leaderboard_embed(leaderboard_data: Dict[str, Any]) -> discord.Embed:
     )
     
     # Add players
-    leaderboard_text = ""
+    rows = []
     for player in players:
         position = player.get('position', 0)
         name = player.get('name', 'Unknown')
         rank = player.get('rank', 'recruit')
         value = player.get('value', 0)
-           
-
+        
         rank_emoji = get_rank_emoji(rank)
         
         # Add special formatting for top 3
-        if position == 1:
-            leaderboard_text += f"🥇 **{position}.** {rank_emoji} **{name}** - {format_number(value)}\n"
-        elif position == 2:
-            leaderboard_text += f"🥈 **{position}.** {rank_emoji} **{name}** - {format_number(value)}\n"
-        elif position == 3:
-            leaderboard_text += f"🥉 **{position}.** {rank_emoji} **{name}** - {format_number(value)}\n"
+        medal = PODIUM_MEDALS.get(position)
+        if medal:
+            rows.append(f"{medal} **{position}.** {rank_emoji} **{name}** - {format_number(value)}")
         else:
-            leaderboard_text += f"**{position}.** {rank_emoji} {name} - {format_number(value)}\n"
+            rows.append(f"**{position}.** {rank_emoji} {name} - {format_number(value)}")
     
-    if leaderboard_text:
+    if rows:
         embed.add_field(
             name="Rankings",
-            value=leaderboard_text.strip(),
+            value="\n".join(rows).strip(),
             inline=False
         )
     else:
@@ -356,6 +613,105 @@ def create_leaderboard_embed(leaderboard_data: Dict[str, Any]) -> discord.Embed:
     
     return embed
 
+def parse_username_list(text: str) -> List[str]:
+    """Split a space/comma separated list of usernames, dropping duplicates."""
+    names = []
+    seen = set()
+    for name in text.replace(',', ' ').split():
+        key = name.lower()
+        if key not in seen:
+            seen.add(key)
+            names.append(name)
+    return names
+
+def create_compare_embed(usernames: List[str], profiles: Dict[str, Optional[Dict[str, Any]]]) -> discord.Embed:
+    """Create Discord embed comparing several players in one table."""
+    header = ("Player", "XP", "Kills", "Deaths", "K/D", "Gold")
+    rows = []
+    not_found = []
+    timed_out = []
+    
+    for username in usernames:
+        if username not in profiles:
+            timed_out.append(username)
+            continue
+        
+        player_data = profiles[username]
+        if not player_data:
+            not_found.append(username)
+            continue
+        
+        stats = player_data.get('personal_stats', {})
+        rows.append((
+            player_data.get('name', username)[:16],
+            format_number(player_data.get('experience', {}).get('current_xp', 0)),
+            format_number(stats.get('kills', 0)),
+            format_number(stats.get('deaths', 0)),
+            f"{stats.get('kd_ratio', 0.0):.2f}",
+            format_number(stats.get('goldboxes', 0))
+        ))
+    
+    embed = discord.Embed(
+        title="⚔️ Player Comparison",
+        color=EMBED_COLOR
+    )
+    
+    if rows:
+        # Monospace table: names left-aligned, numbers right-aligned
+        widths = [max(len(row[i]) for row in rows + [header]) for i in range(len(header))]
+        lines = [
+            "  ".join(cell.ljust(widths[0]) if i == 0 else cell.rjust(widths[i]) for i, cell in enumerate(row))
+            for row in [header] + rows
+        ]
+        embed.description = "```\n" + "\n".join(lines) + "\n```"
+    else:
+        embed.description = "None of these players could be loaded."
+    
+    if not_found:
+        embed.add_field(name="Not Found", value=", ".join(not_found), inline=False)
+    
+    if timed_out:
+        embed.add_field(name="Timed Out", value=", ".join(timed_out), inline=False)
+    
+    return embed
+
+def create_standing_embed(standing: Dict[str, Any]) -> discord.Embed:
+    """Create Discord embed with a player's position in every leaderboard category."""
+    embed = discord.Embed(
+        title=f"📊 {standing['name']}'s Standing",
+        color=EMBED_COLOR
+    )
+    
+    positions = standing['categories']
+    if not positions:
+        embed.description = f"Not in the top {LEADERBOARD_SIZE} of any leaderboard."
+    
+    for category, category_info in LEADERBOARD_CATEGORIES.items():
+        entry = positions.get(category)
+        if entry:
+            value = f"{PODIUM_MEDALS.get(entry['position'], '')} **#{entry['position']}** - {format_number(entry['value'])}".strip()
+        else:
+            value = f"Not in top {LEADERBOARD_SIZE}"
+        embed.add_field(name=category_info['name'], value=value, inline=True)
+    
+    embed.set_footer(text="From the leaderboards fetched")
+    embed.timestamp = datetime.fromtimestamp(standing['fetched_at'], timezone.utc)
+    
+    return embed
+
+def create_not_found_embed(username: str, suggestions: List[str]) -> discord.Embed:
+    """Create error embed for an unknown player, with "did you mean" suggestions."""
+    embed = create_error_embed(f"Player '{username}' not found or profile could not be accessed.")
+    
+    if suggestions:
+        embed.add_field(
+            name="Did you mean",
+            value="\n".join(f"• {name}" for name in suggestions),
+            inline=False
+        )
+    
+    return embed
+
 def create_error_embed(message: str) -> discord.Embed:
     """Create error embed."""
     embed = discord.Embed(
@@ -365,5 +721,3 @@ def create_error_embed(message: str) -> discord.Embed:
     )
     return embed
 
-# Export the bot for main.py
-RTanksBot = RTanksBot
@@ -0,0 +1,269 @@
+"""
+Outbound request governor for the ratings site.
+
+Every scraper request passes through a token bucket (average rate), an
+adaptive concurrency limit (shrinks when upstream latency rises), retries
+with exponential backoff on 429/5xx and a circuit breaker that fails fast
+while the site is down.
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+from config import *
+
+# Circuit breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the circuit is open."""
+
+
+class TokenBucket:
+    """Allow ``rate`` acquisitions per second on average, with bursts up to ``burst``."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.throttled = 0  # acquisitions that had to wait
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        # The lock queues waiters so tokens are handed out in arrival order
+        async with self._lock:
+            self._refill()
+            if self.tokens < 1:
+                self.throttled += 1
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+
+class AdaptiveLimiter:
+    """Concurrency limit adjusted with AIMD on observed latency.
+
+    Each fast, successful request grows the limit by 1/limit (about one per
+    round of requests). A slow or failed request cuts it by
+    HTTP_LIMIT_DECREASE, never below ``min_limit``.
+    """
+
+    def __init__(self, initial: int, min_limit: int, max_limit: int, target_latency: float):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.in_flight = 0
+        self.latency = 0.0  # moving average of request latency in seconds
+        self._condition = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, latency: Optional[float], ok: bool):
+        """Give back a slot and adapt the limit. latency is None if no response arrived."""
+        async with self._condition:
+            self.in_flight -= 1
+
+            if latency is not None:
+                self.latency = latency if not self.latency else 0.8 * self.latency + 0.2 * latency
+
+            if ok and latency is not None and latency <= self.target_latency:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            else:
+                self.limit = max(self.min_limit, self.limit * HTTP_LIMIT_DECREASE)
+
+            self._condition.notify_all()
+
+    async def discard(self):
+        """Give back a slot that was never used, leaving the limit as it is."""
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+
+class CircuitBreaker:
+    """Open after ``failure_threshold`` consecutive failed requests (after retries).
+
+    While open every call is rejected. After ``reset_timeout`` seconds one
+    trial request is let through (half-open); its result closes the circuit
+    or opens it again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._trial_running = False
+
+    def allow(self) -> bool:
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+            self._trial_running = False
+
+        if self.state == CLOSED:
+            return True
+        if self.state == HALF_OPEN and not self._trial_running:
+            self._trial_running = True
+            return True
+
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        if self.state != CLOSED:
+            print("Ratings site is responding again, closing circuit")
+        self.state = CLOSED
+        self.failures = 0
+        self._trial_running = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                print(f"Ratings site failing ({self.failures} in a row), opening circuit for {self.reset_timeout}s")
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+            self._trial_running = False
+
+    def abandon(self):
+        """The caller gave up (cancelled) before the request had a result."""
+        self._trial_running = False
+
+    def retry_in(self) -> float:
+        """Seconds until the next trial request is allowed."""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+
+class UpstreamGovernor:
+    def __init__(self):
+        self.bucket = TokenBucket(HTTP_RATE_LIMIT, HTTP_RATE_BURST)
+        self.limiter = AdaptiveLimiter(HTTP_CONCURRENCY_INITIAL, HTTP_CONCURRENCY_MIN,
+                                       HTTP_CONCURRENCY_MAX, HTTP_TARGET_LATENCY)
+        self.breaker = CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT)
+        self.retries = 0
+        self.rate_limited = 0  # 429 responses received
+
+    async def request(self, send: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``send`` under the rate and concurrency limits, retrying on 429/5xx.
+
+        All attempts, and the waits between them, end within
+        HTTP_REQUEST_DEADLINE of the first one; timeouts are not retried.
+        ``send`` must return an HTTPResponse-like object (``status_code``, ``header()``).
+        Raises CircuitOpenError without calling it while the site is down.
+        The last response (or exception) is passed on once retries run out.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"ratings site unavailable, retrying in {self.breaker.retry_in():.0f}s")
+
+        attempt = 0
+        deadline = None  # every attempt and backoff must fit in HTTP_REQUEST_DEADLINE from the first send
+        error = response = None
+        try:
+            while True:
+                await self.bucket.acquire()
+                await self.limiter.acquire()
+
+                start = time.monotonic()
+                if deadline is None:
+                    deadline = start + HTTP_REQUEST_DEADLINE
+                elif start >= deadline:
+                    # Queued past the deadline: say nothing about the site, keep the last result
+                    await self.limiter.discard()
+                    return self._give_up(error, response)
+
+                error = None
+                try:
+                    response = await asyncio.wait_for(send(), deadline - start)
+                except asyncio.CancelledError:
+                    await self.limiter.release(None, False)
+                    raise
+                except Exception as e:
+                    await self.limiter.release(None, False)
+                    # A timeout means the site hangs; another attempt would only wait longer
+                    if attempt >= HTTP_MAX_RETRIES or isinstance(e, asyncio.TimeoutError):
+                        self.breaker.record_failure()
+                        raise
+                    error = e
+                    response = None
+                    retry_after = None
+                else:
+                    retryable = response.status_code == 429 or response.status_code >= 500
+                    await self.limiter.release(time.monotonic() - start, not retryable)
+
+                    if not retryable:
+                        self.breaker.record_success()
+                        return response
+
+                    if response.status_code == 429:
+                        self.rate_limited += 1
+                    if attempt >= HTTP_MAX_RETRIES:
+                        self.breaker.record_failure()
+                        return response
+                    retry_after = self._retry_after(response)
+
+                attempt += 1
+                delay = retry_after if retry_after is not None else self._backoff(attempt)
+                if time.monotonic() + delay >= deadline:
+                    # No time left for another attempt
+                    return self._give_up(error, response)
+
+                self.retries += 1
+                await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            # Wherever the caller gave up (queued, sending or backing off), free a half-open trial
+            self.breaker.abandon()
+            raise
+
+    def _give_up(self, error: Optional[Exception], response: Any) -> Any:
+        """End a request that ran out of time: one failure, then its last error or response."""
+        self.breaker.record_failure()
+        if error is not None:
+            raise error
+        return response
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter."""
+        return random.uniform(0, min(HTTP_RETRY_MAX_DELAY, HTTP_RETRY_BASE_DELAY * 2 ** attempt))
+
+    def _retry_after(self, response: Any) -> Optional[float]:
+        """Honour a numeric Retry-After header, capped at HTTP_RETRY_MAX_DELAY."""
+        value = response.header('Retry-After')
+        try:
+            return min(float(value), HTTP_RETRY_MAX_DELAY)
+        except (TypeError, ValueError):
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Current limits and counters, to see when and why requests are throttled."""
+        self.bucket._refill()
+        return {
+            'circuit': self.breaker.state,
+            'circuit_retry_in': round(self.breaker.retry_in(), 1),
+            'consecutive_failures': self.breaker.failures,
+            'rejected': self.breaker.rejected,
+            'concurrency_limit': int(self.limiter.limit),
+            'in_flight': self.limiter.in_flight,
+            'latency_avg': round(self.limiter.latency, 3),
+            'tokens': round(self.bucket.tokens, 2),
+            'throttled': self.bucket.throttled,
+            'rate_limited': self.rate_limited,
+            'retries': self.retries
+        }
@@ -0,0 +1,486 @@
+"""
+HTML parsing engines for the RTanks scraper.
+
+Pages can be parsed with BeautifulSoup ("html.parser" or "lxml") or with
+selectolax's lexbor engine. Each engine's tree is turned into the same
+stream of walk events, so the profile and leaderboard collectors below
+produce identical results whichever engine parsed the page.
+"""
+
+import importlib.util
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from config import HTML_PARSER
+
+# Fastest first; "auto" picks the first one that is installed
+ENGINE_PREFERENCE = ["selectolax", "lxml", "html.parser"]
+
+# Module each engine needs
+_ENGINE_MODULES = {
+    "selectolax": "selectolax",
+    "lxml": "lxml",
+    "html.parser": "bs4"
+}
+
+# Walk events
+TAG = 0
+END = 1
+TEXT = 2
+
+# Tags whose strings get_text() leaves out (BeautifulSoup string containers)
+_NON_CONTENT_TAGS = frozenset(['script', 'style', 'template', 'rt', 'rp'])
+
+# Patterns used by the profile collector
+_BOLD_STYLE_RE = re.compile(r'font-weight:\s*bold')
+_EQUIPMENT_CLASS_RE = re.compile(r'equipment|item')
+_PAINT_RE = re.compile(r'Фотон|Граффити|Ирбис|Атом')
+
+# Marker for leaving the stats container during the profile walk
+_STATS_CONTAINER = object()
+
+
+def is_engine_available(engine: str) -> bool:
+    module = _ENGINE_MODULES.get(engine)
+    if module is None:
+        return False
+    if engine == "lxml" and importlib.util.find_spec("bs4") is None:
+        return False
+    return importlib.util.find_spec(module) is not None
+
+
+def available_engines() -> List[str]:
+    """Installed engines, fastest first."""
+    return [engine for engine in ENGINE_PREFERENCE if is_engine_available(engine)]
+
+
+def resolve_engine(preferred: str = HTML_PARSER) -> str:
+    """Pick the configured engine, falling back to the fastest installed one."""
+    if preferred != "auto":
+        if is_engine_available(preferred):
+            return preferred
+        print(f"HTML parser '{preferred}' is not available, falling back")
+
+    engines = available_engines()
+    if not engines:
+        raise RuntimeError("No HTML parser installed (need selectolax, lxml or beautifulsoup4)")
+    return engines[0]
+
+
+def parse_html(content: bytes, engine: str) -> Any:
+    """Parse a page with the given engine and return its document."""
+    if engine == "selectolax":
+        from selectolax.lexbor import LexborHTMLParser
+        return LexborHTMLParser(content)
+
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(content, engine)
+
+
+def _is_soup(document: Any) -> bool:
+    return hasattr(document, 'contents')
+
+
+# --- Tree walking -------------------------------------------------------------
+
+def _soup_events(node: Any) -> Iterator[Tuple]:
+    """Walk events for a BeautifulSoup tree.
+
+    Yields (TAG, name, attrs, node) on entering an element, (END,) on leaving
+    it and (TEXT, string, is_content, node) for every string.
+    """
+    from bs4 import NavigableString, CData
+
+    content_types = (NavigableString, CData)
+    end = (END,)
+    stack = list(reversed(node.contents))
+    while stack:
+        node = stack.pop()
+
+        if node is end:
+            yield end
+            continue
+
+        if isinstance(node, NavigableString):
+            yield (TEXT, node, type(node) in content_types, node)
+            continue
+
+        yield (TAG, node.name, node.attrs, node)
+        stack.append(end)
+        stack.extend(reversed(node.contents))
+
+
+def _lexbor_events(top: Any) -> Iterator[Tuple]:
+    """Walk events for a selectolax lexbor tree, same shape as _soup_events."""
+    end = (END,)
+    top_id = top.mem_id
+    node = top.child
+    while node is not None:
+        tag = node.tag
+
+        if tag == '-text':
+            parent = node.parent
+            is_content = parent is None or parent.tag not in _NON_CONTENT_TAGS
+            yield (TEXT, node.text_content or '', is_content, node)
+        elif tag == '-comment':
+            # BeautifulSoup keeps comments as strings that get_text() skips
+            yield (TEXT, node.comment_content or '', False, node)
+        elif tag[0] != '-':
+            yield (TAG, tag, node.attributes, node)
+            child = node.child
+            if child is not None:
+                node = child
+                continue
+            yield end
+
+        # Move to the next node, closing every element we climb out of
+        sibling = node.next
+        while sibling is None:
+            node = node.parent
+            if node is None or node.mem_id == top_id:
+                return
+            yield end
+            sibling = node.next
+        node = sibling
+
+
+def _events(document: Any) -> Iterator[Tuple]:
+    if _is_soup(document):
+        return _soup_events(document)
+    root = document.root
+    return _lexbor_events(root.parent if root.parent is not None else root)
+
+
+def _classes(attrs: Dict[str, Any]) -> Optional[List[str]]:
+    classes = attrs.get('class')
+    if not classes:
+        return None
+    if isinstance(classes, str):
+        return classes.split()
+    return classes
+
+
+def _has_class(classes: List[str], value: str) -> bool:
+    """Match a class the way BeautifulSoup's class_= does."""
+    return value in classes or ' '.join(classes) == value
+
+
+def _node_text(document_node: Any, strip: bool = False) -> str:
+    """get_text() for a node of either engine."""
+    if hasattr(document_node, 'get_text'):
+        return document_node.get_text(strip=strip)
+
+    parts = []
+    for event in _lexbor_events(document_node):
+        if event[0] == TEXT and event[2]:
+            text = event[1]
+            if strip:
+                text = text.strip()
+                if not text:
+                    continue
+            parts.append(text)
+    return ''.join(parts)
+
+
+def _next_sibling_td(node: Any) -> Optional[Any]:
+    """find_next_sibling('td') for a node of either engine."""
+    if hasattr(node, 'find_next_sibling'):
+        return node.find_next_sibling('td')
+
+    sibling = node.next
+    while sibling is not None:
+        if sibling.tag == 'td':
+            return sibling
+        sibling = sibling.next
+    return None
+
+
+# --- Profile page -------------------------------------------------------------
+
+def collect_profile_nodes(document: Any) -> Dict[str, Any]:
+    """Walk a profile page once and gather the text profile fields come from.
+
+    Text is accumulated the same way get_text() builds it: raw strings for
+    substring checks and stripped strings for cell and heading values.
+    """
+    doc_text = []
+    raw_sinks = [doc_text]  # raw text buffers of the open elements that need one
+    strip_sinks = []  # stripped text buffers of the open elements that need one
+    close_stack = []  # per open element: the buffers/stacks to pop when it ends
+
+    stats_state = 0  # 0 = stats container not seen, 1 = inside it, 2 = closed
+    name_parts = None
+    xp_parts = None
+    tables = []  # per table, in document order: the cells of every row it contains
+    open_tables = []
+    open_rows = []
+    sections = []  # equipment sections: raw text plus first h3/h4 text
+    open_sections = []
+    premium_node = None
+    group_node = None
+    paint_nodes = []
+
+    for event in _events(document):
+        kind = event[0]
+
+        if kind == END:
+            closes = close_stack.pop()
+            if closes:
+                for owner in closes:
+                    if owner is _STATS_CONTAINER:
+                        stats_state = 2
+                    else:
+                        owner.pop()
+            continue
+
+        if kind == TEXT:
+            text = event[1]
+            if premium_node is None and 'Премиум' in text:
+                premium_node = event[3]
+            if group_node is None and 'Группа' in text:
+                group_node = event[3]
+            if _PAINT_RE.search(text):
+                paint_nodes.append(event[3])
+
+            # Only page text counts (no comments, scripts or styles)
+            if event[2]:
+                for sink in raw_sinks:
+                    sink.append(text)
+                if strip_sinks:
+                    stripped = text.strip()
+                    if stripped:
+                        for sink in strip_sinks:
+                            sink.append(stripped)
+            continue
+
+        name = event[1]
+        closes = None
+
+        if name == 'td':
+            cell = []
+            for cells in open_rows:
+                cells.append(cell)
+            strip_sinks.append(cell)
+            closes = [strip_sinks]
+
+        elif name == 'tr':
+            cells = []
+            for rows in open_tables:
+                rows.append(cells)
+            open_rows.append(cells)
+            closes = [open_rows]
+
+        elif name == 'table':
+            rows = []
+            tables.append(rows)
+            open_tables.append(rows)
+            closes = [open_tables]
+
+        elif name == 'div':
+            classes = _classes(event[2])
+            if classes:
+                closes = []
+
+                if stats_state == 0 and _has_class(classes, 'stats container'):
+                    stats_state = 1
+                    closes.append(_STATS_CONTAINER)
+
+                if xp_parts is None and _has_class(classes, 'text_xp'):
+                    xp_parts = []
+                    strip_sinks.append(xp_parts)
+                    closes.append(strip_sinks)
+
+                if any(_EQUIPMENT_CLASS_RE.search(c) for c in classes):
+                    section = {'text': [], 'h3': None, 'h4': None}
+                    sections.append(section)
+                    open_sections.append(section)
+                    raw_sinks.append(section['text'])
+                    closes.append(open_sections)
+                    closes.append(raw_sinks)
+
+        elif name == 'font':
+            if stats_state == 1 and name_parts is None:
+                style = event[2].get('style')
+                if style and _BOLD_STYLE_RE.search(style):
+                    name_parts = []
+                    strip_sinks.append(name_parts)
+                    closes = [strip_sinks]
+
+        elif name == 'h3' or name == 'h4':
+            heading = None
+            for section in open_sections:
+                if section[name] is None:
+                    if heading is None:
+                        heading = []
+                        strip_sinks.append(heading)
+                        closes = [strip_sinks]
+                    section[name] = heading
+
+        close_stack.append(closes)
+
+    # The few values that depend on a matched string's parent element
+    paint = None
+    for paint_node in paint_nodes:
+        parent = paint_node.parent
+        if parent is not None:
+            parent_text = _node_text(parent)
+            if 'Установленный' in parent_text and 'Да' in parent_text:
+                paint = _string_value(paint_node).strip()
+                break
+
+    premium_text = None
+    if premium_node is not None and premium_node.parent is not None:
+        premium_text = _node_text(premium_node.parent)
+
+    group_text = None
+    if group_node is not None and group_node.parent is not None:
+        next_cell = _next_sibling_td(group_node.parent)
+        if next_cell is not None:
+            group_text = _node_text(next_cell, strip=True)
+
+    return {
+        'text': doc_text,
+        'name': name_parts,
+        'xp': xp_parts,
+        'tables': tables,
+        'sections': sections,
+        'paint': paint,
+        'premium_text': premium_text,
+        'group_text': group_text
+    }
+
+
+def _string_value(node: Any) -> str:
+    if isinstance(node, str):
+        return node
+    if node.tag == '-comment':
+        return node.comment_content or ''
+    return node.text_content or ''
+
+
+# --- Leaderboard page ---------------------------------------------------------
+
+def collect_leaderboard_tables(document: Any, category_texts: Dict[str, str]) -> Dict[str, Optional[List[Tuple]]]:
+    """Walk the homepage once and pull out the table rows of every category.
+
+    A category's table is the first table inside the first div.container whose
+    text contains its heading, or the page's first table if no container does.
+    Returns, per category, None when no table was found, otherwise one
+    (position, name, href, img_src, value) tuple per player row.
+    """
+    close_stack = []
+    raw_sinks = []
+    strip_sinks = []
+
+    containers = []  # div.container: raw text and first table
+    open_containers = []
+    first_table = None
+    open_tables = []
+    open_rows = []
+    open_cells = []
+
+    for event in _events(document):
+        kind = event[0]
+
+        if kind == END:
+            closes = close_stack.pop()
+            if closes:
+                for owner in closes:
+                    owner.pop()
+            continue
+
+        if kind == TEXT:
+            if event[2]:
+                text = event[1]
+                for sink in raw_sinks:
+                    sink.append(text)
+                if strip_sinks:
+                    stripped = text.strip()
+                    if stripped:
+                        for sink in strip_sinks:
+                            sink.append(stripped)
+            continue
+
+        name = event[1]
+        closes = None
+
+        if name == 'td':
+            cell = {'text': [], 'link': None, 'img': None}
+            for cells in open_rows:
+                cells.append(cell)
+            open_cells.append(cell)
+            strip_sinks.append(cell['text'])
+            closes = [open_cells, strip_sinks]
+
+        elif name == 'tr':
+            cells = []
+            for rows in open_tables:
+                rows.append(cells)
+            open_rows.append(cells)
+            closes = [open_rows]
+
+        elif name == 'table':
+            rows = []
+            if first_table is None:
+                first_table = rows
+            for container in open_containers:
+                if container['table'] is None:
+                    container['table'] = rows
+            open_tables.append(rows)
+            closes = [open_tables]
+
+        elif name == 'a':
+            link = None
+            for cell in open_cells:
+                if cell['link'] is None:
+                    if link is None:
+                        link = {'href': event[2].get('href') or '', 'text': []}
+                        strip_sinks.append(link['text'])
+                        closes = [strip_sinks]
+                    cell['link'] = link
+
+        elif name == 'img':
+            for cell in open_cells:
+                if cell['img'] is None:
+                    cell['img'] = event[2].get('src') or ''
+
+        elif name == 'div':
+            classes = _classes(event[2])
+            if classes and _has_class(classes, 'container'):
+                container = {'text': [], 'table': None}
+                containers.append(container)
+                open_containers.append(container)
+                raw_sinks.append(container['text'])
+                closes = [open_containers, raw_sinks]
+
+        close_stack.append(closes)
+
+    container_texts = [(''.join(container['text']), container) for container in containers]
+
+    tables = {}
+    for category, target_text in category_texts.items():
+        rows = first_table
+        for container_text, container in container_texts:
+            if target_text in container_text:
+                rows = container['table']
+                break
+
+        if rows is None:
+            tables[category] = None
+            continue
+
+        players = []
+        for cells in rows:
+            if len(cells) >= 3:
+                player_cell = cells[1]
+                link = player_cell['link']
+                if link is not None and player_cell['img'] is not None:
+                    players.append((
+                        ''.join(cells[0]['text']),
+                        ''.join(link['text']),
+                        link['href'],
+                        player_cell['img'],
+                        ''.join(cells[2]['text'])
+                    ))
+        tables[category] = players
+
+    return tables
@@ -0,0 +1,110 @@
+"""
+HTTP transport used by the RTanks scraper.
+Requests go through a pooled aiohttp session with keep-alive connections,
+falling back to a requests.Session run in the default executor.
+"""
+
+import asyncio
+from typing import Dict, Optional
+from config import *
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class HTTPResponse:
+    """Response returned by both transports."""
+
+    __slots__ = ('status_code', 'url', 'content', 'headers')
+
+    def __init__(self, status_code: int, url: str, content: bytes, headers: Dict[str, str]):
+        self.status_code = status_code
+        self.url = url
+        self.content = content
+        self.headers = headers
+
+    def header(self, name: str) -> Optional[str]:
+        """Case-insensitive header lookup."""
+        name = name.lower()
+        for key, value in self.headers.items():
+            if key.lower() == name:
+                return value
+        return None
+
+
+class HTTPClient:
+    def __init__(self, backend: str = HTTP_BACKEND):
+        if backend == "aiohttp" and aiohttp is None:
+            print("aiohttp is not installed, falling back to requests")
+            backend = "requests"
+        self.backend = backend
+        self._session = None  # aiohttp.ClientSession, created lazily on the running loop
+        self._sync_session = None  # requests.Session for the fallback path
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> HTTPResponse:
+        """Fetch a URL and return its status, final URL, body and headers.
+
+        ``headers`` are sent in addition to REQUEST_HEADERS.
+        """
+        if self.backend == "aiohttp":
+            return await self._get_async(url, headers)
+        return await self._get_sync(url, headers)
+
+    async def _get_async(self, url: str, headers: Optional[Dict[str, str]]) -> HTTPResponse:
+        session = self._get_session()
+        async with session.get(url, headers=headers) as response:
+            content = await response.read()
+            return HTTPResponse(response.status, str(response.url), content, dict(response.headers))
+
+    async def _get_sync(self, url: str, headers: Optional[Dict[str, str]]) -> HTTPResponse:
+        session = self._get_sync_session()
+
+        # Run in thread pool to avoid blocking
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(
+            None,
+            lambda: session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+        )
+        return HTTPResponse(response.status_code, response.url, response.content, dict(response.headers))
+
+    def _get_session(self):
+        """Create the pooled aiohttp session on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=HTTP_POOL_LIMIT,
+                limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+                keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=REQUEST_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+            )
+        return self._session
+
+    def _get_sync_session(self):
+        if self._sync_session is None:
+            # Imported on first use: requests is slow to import and only the fallback needs it
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            session.headers.update(REQUEST_HEADERS)
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_LIMIT, pool_maxsize=HTTP_POOL_LIMIT_PER_HOST)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            self._sync_session = session
+        return self._sync_session
+
+    async def close(self):
+        """Close pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+        if self._sync_session is not None:
+            self._sync_session.close()
+            self._sync_session = None
@@ -1,15 +1,90 @@
-from flask import Flask
-from threading import Thread
+"""
+Keep-alive, health and metrics HTTP server.
+Runs on the bot's own event loop (aiohttp.web), so it can report on the
+gateway connection, event-loop lag and scraper freshness directly.
+"""
 
-app = Flask('')
+import asyncio
+import math
+import time
+from typing import Any, Dict, Optional
+from aiohttp import web
+from config import *
+from metrics import REGISTRY, CONTENT_TYPE
 
-@app.route('/')
-def home():
-    return "Bot is alive!"
 
-def run():
-    app.run(host='0.0.0.0', port=8080)
+class KeepAliveServer:
+    def __init__(self, bot, host: str = KEEP_ALIVE_HOST, port: int = KEEP_ALIVE_PORT):
+        self.bot = bot
+        self.host = host
+        self.port = port
+        self.loop_lag = 0.0  # seconds the last lag probe woke up late
+        self._runner: Optional[web.AppRunner] = None
+        self._lag_task: Optional[asyncio.Task] = None
 
-def keep_alive():
-    t = Thread(target=run)
-    t.start()
+    async def start(self):
+        """Start serving and probing loop lag on the running event loop."""
+        app = web.Application()
+        app.router.add_get('/', self.home)
+        app.router.add_get('/health', self.health)
+        app.router.add_get('/metrics', self.metrics)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        self._lag_task = asyncio.create_task(self._measure_loop_lag())
+        print(f"Keep-alive server listening on {self.host}:{self.port}")
+
+    async def stop(self):
+        if self._lag_task is not None:
+            self._lag_task.cancel()
+            self._lag_task = None
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _measure_loop_lag(self):
+        """Sleep for a fixed interval and record how late the loop woke us up."""
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(HEALTH_LAG_INTERVAL)
+            self.loop_lag = max(0.0, loop.time() - start - HEALTH_LAG_INTERVAL)
+
+    async def home(self, request: web.Request) -> web.Response:
+        return web.Response(text="Bot is alive!")
+
+    async def health(self, request: web.Request) -> web.Response:
+        """200 while the gateway is connected and the loop is responsive, 503 otherwise."""
+        report = self.health_report()
+        return web.json_response(report, status=200 if report['status'] != 'unhealthy' else 503)
+
+    async def metrics(self, request: web.Request) -> web.Response:
+        return web.Response(body=REGISTRY.render().encode(), headers={'Content-Type': CONTENT_TYPE})
+
+    def health_report(self) -> Dict[str, Any]:
+        # is_ready() stays True while the gateway reconnects, so look at the websocket itself
+        ws = self.bot.ws
+        latency = self.bot.latency
+        gateway_connected = (ws is not None and ws.open and not self.bot.is_closed()
+                             and math.isfinite(latency))
+
+        last_scrape = self.bot.scraper.last_success_at
+        scrape_age = time.time() - last_scrape if last_scrape else None
+
+        if not gateway_connected or self.loop_lag > HEALTH_MAX_LOOP_LAG:
+            status = 'unhealthy'
+        elif scrape_age is None or scrape_age > HEALTH_MAX_SCRAPE_AGE:
+            # Discord side works, but we are serving cached or stored data
+            status = 'degraded'
+        else:
+            status = 'ok'
+
+        return {
+            'status': status,
+            'gateway_connected': gateway_connected,
+            'gateway_latency': round(latency, 3) if math.isfinite(latency) else None,  # NaN before connecting
+            'loop_lag': round(self.loop_lag, 4),
+            'seconds_since_last_scrape': None if scrape_age is None else round(scrape_age, 1),
+            'upstream': self.bot.scraper.get_upstream_stats()['circuit']
+        }
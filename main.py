@@ -1,7 +1,10 @@
+import startup  # first, so startup timing covers the imports below
 import asyncio
 import os
 from discord_bot import RTanksBot
-from keep_alive import keep_alive
+from keep_alive import KeepAliveServer
+
+startup.mark("imports")
 
 
 async def main():
@@ -15,6 +18,15 @@ async def main():
     # Create and run the bot
     bot = RTanksBot()
     
+    # Health and metrics server, on the same event loop as the bot
+    server = KeepAliveServer(bot)
+    
+    # A keep-alive failure (e.g. the port is taken) must not keep the bot offline
+    try:
+        await server.start()
+    except Exception as e:
+        print(f"Error starting keep-alive server: {e}")
+    
     try:
         await bot.start(bot_token)
     except KeyboardInterrupt:
@@ -22,8 +34,8 @@ async def main():
     except Exception as e:
         print(f"Error running bot: {e}")
     finally:
+        await server.stop()
         await bot.close()
 
 if __name__ == "__main__":
-    keep_alive()
     asyncio.run(main())
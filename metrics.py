@@ -0,0 +1,207 @@
+"""
+Minimal Prometheus-style metrics: counters, gauges and histograms
+rendered in the text exposition format served at /metrics.
+
+Recording a value is a dict lookup and an addition, so instrumented code
+paths cost next to nothing when they are not running.
+"""
+
+import math
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Default histogram buckets in seconds, from sub-millisecond parsing to slow upstream fetches
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def executor_queue_depth(executor) -> int:
+    """Work items queued on a ThreadPoolExecutor that no thread has picked up yet."""
+    work_queue = getattr(executor, '_work_queue', None)
+    return work_queue.qsize() if work_queue is not None else 0
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing count, one per label combination."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1):
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0)
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+                for labels, value in sorted(self._values.items())]
+
+
+class Gauge(Metric):
+    """Value that goes up and down. Either set directly or read from a callback at scrape time.
+
+    A callback returns a number, or {label values tuple: number} for labelled gauges.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 function: Optional[Callable[[], object]] = None):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._function = function
+
+    def set(self, value: float, *label_values: str):
+        self._values[label_values] = value
+
+    def set_function(self, function: Callable[[], object]):
+        self._function = function
+
+    def samples(self) -> List[str]:
+        values = dict(self._values)
+        if self._function is not None:
+            try:
+                result = self._function()
+            except Exception as e:
+                print(f"Error collecting metric {self.name}: {e}")
+                result = None
+            if isinstance(result, dict):
+                values.update(result)
+            elif result is not None:
+                values[()] = result
+
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+                for labels, value in sorted(values.items())]
+
+
+class Histogram(Metric):
+    """Distribution of observed values over fixed cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (last one is +Inf), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *label_values: str):
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    @contextmanager
+    def time(self, *label_values: str):
+        """Observe how long the with-block takes."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def count(self, *label_values: str) -> int:
+        series = self._series.get(label_values)
+        return sum(series[0]) if series else 0
+
+    def samples(self) -> List[str]:
+        lines = []
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = 'le="' + ("+Inf" if math.isinf(bound) else repr(bound)) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+REGISTRY = Registry()
+
+# Content type of Registry.render() output
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Scraper
+FETCH_SECONDS = REGISTRY.register(Histogram(
+    "rtanks_fetch_seconds", "Time to download a page from the ratings site, including retries.", ["page"]))
+PARSE_SECONDS = REGISTRY.register(Histogram(
+    "rtanks_parse_seconds", "Time to parse a downloaded page.", ["page"]))
+PARSE_WAIT_SECONDS = REGISTRY.register(Histogram(
+    "rtanks_parse_wait_seconds", "Time a page waited in the parse pool queue.", ["page"]))
+UPSTREAM_RESPONSES = REGISTRY.register(Counter(
+    "rtanks_upstream_responses_total", "Responses from the ratings site by status code.", ["page", "status"]))
+
+# Discord
+RENDER_SECONDS = REGISTRY.register(Histogram(
+    "rtanks_render_seconds", "Time to build an embed, including render cache lookups.", ["embed"]))
+COMMAND_SECONDS = REGISTRY.register(Histogram(
+    "rtanks_command_seconds", "Slash command latency from receipt to reply.", ["command"]))
+GATEWAY_LATENCY = REGISTRY.register(Gauge(
+    "rtanks_gateway_latency_seconds", "Discord gateway heartbeat latency."))
+STARTUP_SECONDS = REGISTRY.register(Gauge(
+    "rtanks_startup_seconds", "Seconds from process start until each startup phase finished.", ["phase"]))
+
+# Caches and executors, read at scrape time
+CACHE_HIT_RATIO = REGISTRY.register(Gauge(
+    "rtanks_cache_hit_ratio", "Hits divided by lookups for each cache.", ["cache"]))
+EXECUTOR_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "rtanks_executor_queue_depth", "Work items waiting for a free executor thread.", ["executor"]))
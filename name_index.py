@@ -0,0 +1,187 @@
+"""
+In-memory indexes of known player names: prefix search for slash command
+autocomplete and fuzzy search for "did you mean" suggestions.
+"""
+
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set
+
+
+class PrefixIndex:
+    """Case-insensitive prefix search over a sorted list of names.
+
+    ``_keys`` holds the lowercased names in sorted order and ``_names`` the
+    display spelling at the same position, so a lookup is two bisects and
+    a slice.
+    """
+
+    def __init__(self, names: Iterable[str] = ()):
+        self._keys: List[str] = []
+        self._names: List[str] = []
+        self.update(names)
+
+    def add(self, name: str):
+        """Add one name, or update the spelling of a known one."""
+        name = name.strip()
+        if not name:
+            return
+
+        key = name.lower()
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            self._names[i] = name
+        else:
+            self._keys.insert(i, key)
+            self._names.insert(i, name)
+
+    def update(self, names: Iterable[str]):
+        """Add many names at once with a single sort."""
+        merged = dict(zip(self._keys, self._names))
+        for name in names:
+            name = name.strip()
+            if name:
+                merged[name.lower()] = name
+
+        self._keys = sorted(merged)
+        self._names = [merged[key] for key in self._keys]
+
+    def search(self, prefix: str, limit: int = 25) -> List[str]:
+        """Names starting with prefix (any case), alphabetically, at most limit."""
+        key = prefix.strip().lower()
+        start = bisect_left(self._keys, key)
+        # Every key with this prefix sorts below prefix + the highest code point
+        end = bisect_left(self._keys, key + "\U0010ffff", start)
+        return self._names[start:min(end, start + limit)]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, name: str) -> bool:
+        key = name.strip().lower()
+        i = bisect_left(self._keys, key)
+        return i < len(self._keys) and self._keys[i] == key
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Levenshtein distance, or max_distance + 1 once it is known to exceed max_distance.
+
+    Only cells within max_distance of the diagonal are computed; anything
+    further out already costs more than the limit.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if len(a) - len(b) > max_distance:
+        return max_distance + 1
+
+    too_far = max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        low = max(1, i - max_distance)
+        high = min(len(b), i + max_distance)
+        current = [too_far] * (len(b) + 1)
+        if low == 1:
+            current[0] = i
+        row_min = current[0]
+        for j in range(low, high + 1):
+            cost = previous[j - 1] + (char_a != b[j - 1])
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            current[j] = cost
+            if cost < row_min:
+                row_min = cost
+        if row_min > max_distance:
+            return too_far
+        previous = current
+    return min(previous[-1], too_far)
+
+
+class TrigramIndex:
+    """Fuzzy name lookup: trigram overlap picks candidates, edit distance ranks them.
+
+    Each name is split into overlapping 3-character chunks of its padded,
+    lowercased form. A query only looks at names sharing a trigram with it,
+    and only the best ``candidates`` of those get the exact (slower) edit
+    distance. Trigrams found in more than ``common_fraction`` of all names
+    (think "pla" in "Player_123") are skipped once the two rarest ones are
+    counted, so lookups stay around a millisecond at tens of thousands of
+    names.
+    """
+
+    def __init__(self, names: Iterable[str] = (), candidates: int = 30, common_fraction: float = 0.05):
+        self.candidates = candidates
+        self.common_fraction = common_fraction
+        self._keys: List[str] = []  # id -> lowercased name
+        self._names: List[str] = []  # id -> display name
+        self._ids: Dict[str, int] = {}  # lowercased name -> id
+        self._postings: Dict[str, List[int]] = {}  # trigram -> ids of names containing it
+        self.update(names)
+
+    @staticmethod
+    def _trigrams(key: str) -> Set[str]:
+        padded = f"  {key} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def add(self, name: str):
+        """Add one name, or update the spelling of a known one."""
+        name = name.strip()
+        if not name:
+            return
+
+        key = name.lower()
+        known = self._ids.get(key)
+        if known is not None:
+            self._names[known] = name
+            return
+
+        name_id = len(self._keys)
+        self._ids[key] = name_id
+        self._keys.append(key)
+        self._names.append(name)
+        for trigram in self._trigrams(key):
+            self._postings.setdefault(trigram, []).append(name_id)
+
+    def update(self, names: Iterable[str]):
+        for name in names:
+            self.add(name)
+
+    def closest(self, query: str, limit: int = 5, max_distance: Optional[int] = None) -> List[str]:
+        """Known names nearest to query by edit distance, closest first.
+
+        max_distance defaults to a third of the query length (at least 2).
+        """
+        key = query.strip().lower()
+        if not key:
+            return []
+        if max_distance is None:
+            max_distance = max(2, len(key) // 3)
+
+        # Rarest trigrams first: they narrow the candidates down the most
+        postings = sorted(
+            (self._postings[trigram] for trigram in self._trigrams(key) if trigram in self._postings),
+            key=len
+        )
+        common = max(500, int(len(self._keys) * self.common_fraction))
+
+        shared = Counter()
+        for i, ids in enumerate(postings):
+            if i >= 2 and len(ids) > common:
+                break
+            shared.update(ids)
+
+        scored = []
+        for name_id, _ in shared.most_common(self.candidates):
+            distance = edit_distance(key, self._keys[name_id], max_distance)
+            if distance <= max_distance:
+                scored.append((distance, self._keys[name_id], name_id))
+
+        scored.sort()
+        return [self._names[name_id] for _, _, name_id in scored[:limit]]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, name: str) -> bool:
+        return name.strip().lower() in self._ids
@@ -0,0 +1,107 @@
+"""
+Worker pool that keeps HTML parsing off the event loop.
+
+Workers take the raw page bytes and return plain dicts, so the same
+module-level functions run in threads or, to sidestep the GIL, in
+separate processes.
+"""
+
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+from config import *
+from html_engines import parse_html
+from metrics import PARSE_SECONDS, PARSE_WAIT_SECONDS, executor_queue_depth
+from parsers import parse_player_profile, parse_leaderboard
+
+
+def parse_profile_page(content: bytes, engine: str) -> Optional[Dict[str, Any]]:
+    """Profile page bytes -> profile dict (see parsers.parse_player_profile)."""
+    return parse_player_profile(parse_html(content, engine))
+
+
+def parse_leaderboard_page(content: bytes, engine: str) -> Optional[Dict[str, Any]]:
+    """Homepage bytes -> {category: players} (see parsers.parse_leaderboard)."""
+    return parse_leaderboard(parse_html(content, engine))
+
+
+def _timed(func: Callable[[bytes, str], Any], content: bytes, engine: str) -> Tuple[Any, float, float]:
+    """Run a parse function and report (result, wall-clock start, duration)."""
+    started_at = time.time()
+    start = time.perf_counter()
+    result = func(content, engine)
+    return result, started_at, time.perf_counter() - start
+
+
+class ParsePool:
+    """Parse pages on "thread" or "process" workers, or "inline" on the event loop.
+
+    At most ``max_pending`` parses are queued or running; further callers
+    wait for a slot, so a burst of large pages cannot pile up unbounded.
+    """
+
+    def __init__(self, mode: str = PARSE_POOL_MODE, workers: int = PARSE_POOL_WORKERS,
+                 max_pending: int = PARSE_POOL_MAX_PENDING):
+        self.mode = mode
+        self.workers = workers
+        self._slots = asyncio.Semaphore(max_pending)
+        self._executor: Optional[Executor] = None
+        self.pending = 0  # parses submitted and not finished, including those waiting for a slot
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                # spawn, not fork: forking a process that already runs threads is unsafe
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context("spawn"))
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='html-parse')
+        return self._executor
+
+    async def parse(self, func: Callable[[bytes, str], Any], content: bytes, engine: str, page: str) -> Any:
+        """Run ``func(content, engine)`` on a worker and return its result.
+
+        ``page`` labels the parse and queue wait timings in the metrics.
+        """
+        self.pending += 1
+        try:
+            if self.mode == "inline":
+                result, _, duration = _timed(func, content, engine)
+                PARSE_SECONDS.observe(duration, page)
+                return result
+
+            submitted_at = time.time()
+            async with self._slots:
+                loop = asyncio.get_running_loop()
+                result, started_at, duration = await loop.run_in_executor(
+                    self._get_executor(), _timed, func, content, engine
+                )
+
+            PARSE_WAIT_SECONDS.observe(max(0.0, started_at - submitted_at), page)
+            PARSE_SECONDS.observe(duration, page)
+            return result
+        finally:
+            self.pending -= 1
+
+    def queue_depth(self) -> int:
+        """Parses submitted but not yet picked up by a worker."""
+        if self.mode == "process" and self._executor is not None:
+            # Process pools queue internally; count everything not finished
+            return self.pending
+        return executor_queue_depth(self._executor)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'mode': self.mode,
+            'workers': self.workers,
+            'pending': self.pending,
+            'queued': self.queue_depth()
+        }
+
+    def close(self):
+        """Stop the workers; parses still queued are cancelled."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
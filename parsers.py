@@ -0,0 +1,213 @@
+"""
+Page parsers: turn a parsed HTML document (any engine from html_engines)
+into the plain dicts the bot works with.
+
+These are plain functions without state, so the parse workers call them
+directly, in threads or in separate processes.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+from config import *
+from utils import *
+from html_engines import collect_profile_nodes, collect_leaderboard_tables
+from rank_system import get_rank_from_xp, get_rank_progress
+
+
+def parse_player_profile(document: Any) -> Optional[Dict[str, Any]]:
+    """Parse player profile data from a parsed page (any engine)."""
+    try:
+        # Collect everything we need in a single walk over the tree
+        page = collect_profile_nodes(document)
+
+        # Check if this is a redirect page (player not found)
+        if "Found. Redirecting to /" in ''.join(page['text']):
+            return None
+
+        # Player name is in a bold font tag inside the stats container
+        if page['name'] is None:
+            return None
+
+        player_name = ''.join(page['name'])
+
+        # Determine rank based on XP
+        current_xp = _parse_current_xp(page['xp'])
+        rank = get_rank_from_xp(current_xp)
+        rank_progress = get_rank_progress(current_xp)
+
+        return {
+            'name': player_name,
+            'rank': rank,
+            'experience': rank_progress,
+            'leaderboard_positions': _build_leaderboard_positions(page['tables']),
+            'personal_stats': _build_personal_stats(page['tables']),
+            'equipment': _build_equipment_info(page['sections'], page['paint']),
+            'premium': _build_premium_status(page['premium_text']),
+            'group': _build_group_info(page['group_text'])
+        }
+
+    except Exception as e:
+        print(f"Error parsing player profile: {e}")
+        return None
+
+
+def _parse_current_xp(xp_parts: Optional[List[str]]) -> int:
+    """Parse current XP from the text_xp progress text."""
+    if xp_parts is None:
+        return 0
+
+    # Parse current XP from text like "125 919 / 156 000"
+    match = re.search(r'(\d+(?:\s+\d+)*)\s*/\s*(\d+(?:\s+\d+)*)', ''.join(xp_parts))
+    if match:
+        return parse_number(match.group(1))
+
+    return 0
+
+
+def _build_leaderboard_positions(tables: List[List[List[List[str]]]]) -> Dict[str, Any]:
+    """Build current leaderboard positions from the first table."""
+    positions = {}
+
+    if not tables:
+        return positions
+
+    # Map Russian categories to English
+    category_mapping = {
+        'По опыту': 'experience',
+        'Голдоловов': 'goldboxes',
+        'По киллам': 'kills',
+        'По эффективности': 'efficiency',
+        'По кристаллам': 'crystals'
+    }
+
+    for cells in tables[0]:
+        if len(cells) >= 3:
+            category = ''.join(cells[0])
+
+            eng_category = category_mapping.get(category, category.lower())
+            positions[eng_category] = {
+                'position': ''.join(cells[1]),
+                'value': ''.join(cells[2])
+            }
+
+    return positions
+
+
+def _build_personal_stats(tables: List[List[List[List[str]]]]) -> Dict[str, Any]:
+    """Build personal statistics like kills, deaths, KD ratio from table rows."""
+    stats = {}
+
+    for rows in tables:
+        for cells in rows:
+            if len(cells) >= 2:
+                key = ''.join(cells[0])
+                value = ''.join(cells[1])
+
+                # Map Russian stats to English
+                if 'Уничтожил' in key:
+                    stats['kills'] = parse_number(value)
+                elif 'Подбит' in key:
+                    stats['deaths'] = parse_number(value)
+                elif 'У/П' in key:
+                    try:
+                        stats['kd_ratio'] = float(value.replace(',', '.'))
+                    except ValueError:
+                        stats['kd_ratio'] = 0.0
+                elif 'золотых ящиков' in key:
+                    stats['goldboxes'] = parse_number(value)
+                elif 'Группа' in key:
+                    stats['group'] = translate_russian_to_english(value)
+                elif 'Премиум' in key:
+                    stats['premium'] = 'Да' in value
+
+    return stats
+
+
+def _build_equipment_info(sections: List[Dict[str, Any]], paint: Optional[str]) -> Dict[str, Any]:
+    """Build currently equipped items from the equipment sections."""
+    equipment = {
+        'turret': None,
+        'hull': None,
+        'paint': None,
+        'resistances': []
+    }
+
+    # Equipment items are shown with "Установленный: Да"
+    for section in sections:
+        section_text = ''.join(section['text'])
+        if 'Установленный' in section_text and 'Да' in section_text:
+            # This item is equipped
+            item_name = section['h3'] if section['h3'] is not None else section['h4']
+            if item_name is not None:
+                name = parse_equipment_name(''.join(item_name))
+
+                # Translate and determine equipment type based on name
+                translated_name = translate_russian_to_english(name)
+                if any(turret in translated_name.lower() for turret in ['freeze', 'smoky', 'isida', 'hammer', 'twins', 'flamethrower']):
+                    equipment['turret'] = translated_name
+                elif any(hull in translated_name.lower() for hull in ['hunter', 'wasp', 'dictator', 'titan', 'viking', 'hornet']):
+                    equipment['hull'] = translated_name
+                elif any(resist in translated_name.lower() for resist in ['dolphin', 'ocelot', 'badger', 'wolf', 'panther']):
+                    equipment['resistances'].append(translated_name)
+
+    # Paint (colormap) is the first paint name whose element is marked "Установленный: Да"
+    if paint is not None:
+        equipment['paint'] = translate_russian_to_english(paint)
+
+    return equipment
+
+
+def _build_premium_status(premium_text: Optional[str]) -> bool:
+    """Check if player has premium status."""
+    # Text of the element holding the first "Премиум" string
+    if premium_text is not None:
+        return 'Да' in premium_text
+
+    return False
+
+
+def _build_group_info(group_text: Optional[str]) -> str:
+    """Find group/clan information."""
+    # Text of the cell after the first "Группа" string
+    if group_text is not None:
+        return translate_russian_to_english(group_text)
+
+    return "No Group"
+
+
+def parse_leaderboard(document: Any) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+    """Parse every leaderboard category from the homepage (any engine)."""
+    try:
+        # Map category to Russian text to find the right table
+        category_text_map = {
+            'experience': 'по заработанному опыту',
+            'crystals': 'по заработанным кристаллам',
+            'kills': 'по убийствам',
+            'goldboxes': 'по пойманным голдам'
+        }
+
+        tables = collect_leaderboard_tables(document, category_text_map)
+
+        if all(rows is None for rows in tables.values()):
+            return None
+
+        categories = {}
+        for category, rows in tables.items():
+            players = []
+
+            for position, player_name, player_url, rank_img, value in (rows or []):
+                players.append({
+                    'position': int(position) if position.isdigit() else 0,
+                    'name': player_name,
+                    'rank': parse_rank_from_image(rank_img),
+                    'value': parse_number(value),
+                    'profile_url': f"{RTANKS_BASE_URL}{player_url}" if player_url else None
+                })
+
+            categories[category] = players
+
+        return categories
+
+    except Exception as e:
+        print(f"Error parsing leaderboard: {e}")
+        return None
@@ -0,0 +1,90 @@
+"""
+Background leaderboard prefetcher.
+Keeps the homepage snapshot fresh and every leaderboard page embed pre-built,
+so /leaderboard and the page buttons never wait on the ratings site.
+"""
+
+import asyncio
+import random
+from typing import Any, Callable, Dict, Optional, Tuple
+from config import *
+
+
+class LeaderboardPrefetcher:
+    def __init__(self, scraper, render: Callable[[Dict[str, Any]], Any]):
+        self.scraper = scraper
+        self.render = render  # builds the embed for one page of leaderboard data
+        self.pages: Dict[Tuple[str, int], Tuple[Dict[str, Any], Any]] = {}
+        self.failures = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the refresh loop on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def get_page(self, category: str, page: int) -> Tuple[Optional[Dict[str, Any]], Any]:
+        """Get (page data, embed) for a leaderboard page.
+
+        Pre-built pages are returned straight away. Before the first refresh
+        has succeeded this falls back to scraping.
+        """
+        cached = self.pages.get((category, page))
+        if cached is not None:
+            return cached
+
+        page_data = await self.scraper.get_leaderboard(category, page)
+        if not page_data:
+            return None, None
+        return page_data, self.render(page_data)
+
+    async def _run(self):
+        while True:
+            try:
+                snapshot = await self.scraper.refresh_leaderboard_snapshot()
+            except Exception as e:
+                print(f"Error prefetching leaderboard: {e}")
+                snapshot = None
+
+            if snapshot:
+                self.failures = 0
+                self._build_pages(snapshot)
+                delay = LEADERBOARD_PREFETCH_INTERVAL
+            else:
+                # Keep serving the last good pages and back off exponentially
+                self.failures += 1
+                delay = min(LEADERBOARD_PREFETCH_RETRY_DELAY * 2 ** (self.failures - 1), LEADERBOARD_PREFETCH_MAX_BACKOFF)
+                print(f"Leaderboard prefetch failed ({self.failures} in a row), retrying in {delay}s")
+
+                if not self.pages:
+                    # Nothing fetched since startup yet: serve the last stored snapshot meanwhile
+                    stored = await self.scraper.restore_leaderboard_snapshot()
+                    if stored:
+                        self._build_pages(stored)
+
+            delay += random.uniform(-LEADERBOARD_PREFETCH_JITTER, LEADERBOARD_PREFETCH_JITTER)
+            await asyncio.sleep(max(delay, 1))
+
+    def _build_pages(self, snapshot: Dict[str, Any]):
+        """Render every page of every category from a snapshot."""
+        pages = {}
+        for category in LEADERBOARD_CATEGORIES:
+            page = 1
+            while True:
+                page_data = self.scraper.paginate_leaderboard(snapshot, category, page)
+                pages[(category, page)] = (page_data, self.render(page_data))
+                if not page_data['has_next']:
+                    break
+                page += 1
+
+        # Swap in the complete set at once
+        self.pages = pages
@@ -3,6 +3,10 @@ RTanks rank system based on XP thresholds.
 This system determines ranks based on experience points.
 """
 
+from bisect import bisect_right
+from itertools import repeat
+from typing import Iterable, List, NamedTuple, Optional
+
 # XP thresholds for each rank (from the official RTanks rank system)
 RANK_XP_THRESHOLDS = [
     (0, "recruit"),
@@ -38,44 +42,72 @@ RANK_XP_THRESHOLDS = [
     (1600000, "legend-premium")
 ]
 
+# Parallel arrays for bisect lookups. A bisect_right over the thresholds gives
+# the number of ranks reached, which indexes straight into _RANK_BY_COUNT
+# (slot 0 covers negative XP).
+_THRESHOLDS = [threshold for threshold, _ in RANK_XP_THRESHOLDS]
+_RANK_NAMES = [rank for _, rank in RANK_XP_THRESHOLDS]
+_RANK_BY_COUNT = ["recruit"] + _RANK_NAMES
+
+
+class RankInfo(NamedTuple):
+    rank: str
+    current_threshold: int
+    next_rank: Optional[str]
+    next_threshold: Optional[int]
+    progress: float  # fraction of the way to the next rank, 1.0 at max rank
+
+
+def resolve_rank(xp: int) -> RankInfo:
+    """Get rank, next rank, surrounding thresholds and progress for an XP amount in O(log n)."""
+    index = bisect_right(_THRESHOLDS, xp) - 1
+    if index < 0:
+        index = 0
+
+    current_threshold = _THRESHOLDS[index]
+    if index + 1 < len(_THRESHOLDS):
+        next_rank = _RANK_NAMES[index + 1]
+        next_threshold = _THRESHOLDS[index + 1]
+        progress = (xp - current_threshold) / (next_threshold - current_threshold)
+        progress = min(max(progress, 0.0), 1.0)
+    else:
+        next_rank = None
+        next_threshold = None
+        progress = 1.0
+
+    return RankInfo(_RANK_NAMES[index], current_threshold, next_rank, next_threshold, progress)
+
+
 def get_rank_from_xp(xp: int) -> str:
     """Get rank based on XP amount."""
-    if xp < 0:
-        return "recruit"
-    
-    # Find the highest rank threshold that the XP meets
-    current_rank = "recruit"
-    for threshold, rank in RANK_XP_THRESHOLDS:
-        if xp >= threshold:
-            current_rank = rank
-        else:
-            break
-    
-    return current_rank
+    return _RANK_BY_COUNT[bisect_right(_THRESHOLDS, xp)]
+
+
+def get_ranks_from_xp(xp_values: Iterable[int]) -> List[str]:
+    """Get ranks for many XP amounts in one call.
+
+    Lists and other iterables are resolved with C-level map/bisect; numpy
+    arrays use searchsorted. Either way there is no Python loop per player.
+    """
+    if type(xp_values).__module__ == 'numpy':
+        import numpy as np
+        counts = np.searchsorted(np.asarray(_THRESHOLDS), xp_values, side='right')
+        return list(map(_RANK_BY_COUNT.__getitem__, counts.ravel().tolist()))
+
+    counts = map(bisect_right, repeat(_THRESHOLDS), xp_values)
+    return list(map(_RANK_BY_COUNT.__getitem__, counts))
+
 
 def get_rank_progress(xp: int) -> dict:
     """Get current rank and progress to next rank."""
-    current_rank = get_rank_from_xp(xp)
-    
-    # Find current and next thresholds
-    current_threshold = 0
-    next_threshold = None
-    next_rank = None
-    
-    for i, (threshold, rank) in enumerate(RANK_XP_THRESHOLDS):
-        if rank == current_rank:
-            current_threshold = threshold
-            # Get next rank if exists
-            if i < len(RANK_XP_THRESHOLDS) - 1:
-                next_threshold = RANK_XP_THRESHOLDS[i + 1][0]
-                next_rank = RANK_XP_THRESHOLDS[i + 1][1]
-            break
+    info = resolve_rank(xp)
+    next_threshold = info.next_threshold
     
     return {
-        'current_rank': current_rank,
+        'current_rank': info.rank,
         'current_xp': xp,
-        'current_threshold': current_threshold,
+        'current_threshold': info.current_threshold,
         'next_threshold': next_threshold,
-        'next_rank': next_rank,
+        'next_rank': info.next_rank,
         'progress_text': f"{xp:,} / {next_threshold:,}" if next_threshold else f"{xp:,} (Max Rank)"
-    }
\ No newline at end of file
+    }
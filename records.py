@@ -0,0 +1,145 @@
+"""
+Compact record types for parsed data the bot keeps in memory.
+
+The parsers produce plain dicts. Whatever is cached for a long time (the
+profile cache, page cache and leaderboard snapshots) is converted to these
+``__slots__`` records, which need a fraction of a dict's memory, and
+converted back with ``to_dict()`` for the embed builders and the store.
+Rank keys and category names are interned, so every record shares one
+copy of each.
+"""
+
+import sys
+from typing import Any, Dict, List
+
+# Marks a key the source dict did not have, so to_dict() reproduces it exactly
+MISSING = type('Missing', (), {'__repr__': lambda self: 'MISSING', '__slots__': ()})()
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Record:
+    """Base for dict-shaped records: one slot per key, in the dict's key order."""
+
+    __slots__ = ()
+    _interned: frozenset = frozenset()  # fields whose string values are interned
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Record":
+        record = cls.__new__(cls)
+        for field in cls.__slots__:
+            value = data.get(field, MISSING)
+            if field in cls._interned:
+                value = _intern(value)
+            object.__setattr__(record, field, value)
+        return record
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {}
+        for field in self.__slots__:
+            value = getattr(self, field)
+            if value is not MISSING:
+                data[field] = value
+        return data
+
+    def __eq__(self, other: Any) -> bool:
+        return type(self) is type(other) and all(
+            getattr(self, field) == getattr(other, field) for field in self.__slots__
+        )
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class LeaderboardRow(Record):
+    """One player on a homepage leaderboard."""
+
+    __slots__ = ('position', 'name', 'rank', 'value', 'profile_url')
+    _interned = frozenset({'rank'})
+
+
+class RankProgress(Record):
+    """Output of rank_system.get_rank_progress."""
+
+    __slots__ = ('current_rank', 'current_xp', 'current_threshold', 'next_threshold', 'next_rank', 'progress_text')
+    _interned = frozenset({'current_rank', 'next_rank'})
+
+
+class PersonalStats(Record):
+    """Combat and account stats from a profile; keys missing on the page stay missing."""
+
+    __slots__ = ('kills', 'deaths', 'kd_ratio', 'goldboxes', 'group', 'premium')
+    _interned = frozenset({'group'})
+
+
+class Equipment(Record):
+    """Equipped turret, hull, paint and resistance modules."""
+
+    __slots__ = ('turret', 'hull', 'paint', 'resistances')
+    _interned = frozenset({'turret', 'hull', 'paint'})
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Equipment":
+        record = super().from_dict(data)
+        if isinstance(record.resistances, list):
+            record.resistances = tuple(_intern(name) for name in record.resistances)
+        return record
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = super().to_dict()
+        if isinstance(data.get('resistances'), tuple):
+            data['resistances'] = list(data['resistances'])
+        return data
+
+
+class PlayerProfile(Record):
+    """A parsed profile page, plus the username and URL it was fetched with."""
+
+    __slots__ = ('name', 'rank', 'experience', 'leaderboard_positions', 'personal_stats',
+                 'equipment', 'premium', 'group', 'username', 'profile_url')
+    _interned = frozenset({'rank', 'group'})
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PlayerProfile":
+        record = super().from_dict(data)
+        if isinstance(record.experience, dict):
+            record.experience = RankProgress.from_dict(record.experience)
+        if isinstance(record.personal_stats, dict):
+            record.personal_stats = PersonalStats.from_dict(record.personal_stats)
+        if isinstance(record.equipment, dict):
+            record.equipment = Equipment.from_dict(record.equipment)
+        if isinstance(record.leaderboard_positions, dict):
+            # {category: {'position', 'value'}} -> ((category, position, value), ...)
+            record.leaderboard_positions = tuple(
+                (sys.intern(category), entry['position'], entry['value'])
+                for category, entry in record.leaderboard_positions.items()
+            )
+        return record
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = super().to_dict()
+        for field in ('experience', 'personal_stats', 'equipment'):
+            if isinstance(data.get(field), Record):
+                data[field] = data[field].to_dict()
+        if isinstance(data.get('leaderboard_positions'), tuple):
+            data['leaderboard_positions'] = {
+                category: {'position': position, 'value': value}
+                for category, position, value in data['leaderboard_positions']
+            }
+        return data
+
+
+def compact_leaderboard(categories: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[LeaderboardRow]]:
+    """{category: [row dicts]} from parsers.parse_leaderboard -> {category: [LeaderboardRow]}."""
+    return {
+        sys.intern(category): [LeaderboardRow.from_dict(row) for row in rows]
+        for category, rows in categories.items()
+    }
+
+
+def expand_leaderboard(categories: Dict[str, List[LeaderboardRow]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Inverse of compact_leaderboard."""
+    return {category: [row.to_dict() for row in rows] for category, rows in categories.items()}
@@ -1,410 +1,390 @@
-import requests
-from bs4 import BeautifulSoup
-import re
 from typing import Optional, Dict, List, Any
 import asyncio
+import hashlib
+import time
 from config import *
 from utils import *
-from rank_system import get_rank_from_xp, get_rank_progress
+from http_client import HTTPClient
+from governor import UpstreamGovernor
+from cache import TTLCache, SingleFlight, FRESH, STALE
+from html_engines import resolve_engine
+from metrics import FETCH_SECONDS, UPSTREAM_RESPONSES
+from parse_pool import ParsePool, parse_profile_page, parse_leaderboard_page
+from name_index import PrefixIndex, TrigramIndex
+from records import LeaderboardRow, PlayerProfile, compact_leaderboard
 
 class RTanksScraper:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update(REQUEST_HEADERS)
+    def __init__(self, store=None):
+        self.http = HTTPClient()
+        self.governor = UpstreamGovernor()  # rate limit, retries and circuit breaker for self.http
+        self.store = store  # optional SnapshotStore, used as a fallback when the site is down
+        self.parser_engine = resolve_engine()
+        self.parse_pool = ParsePool()  # parses downloaded pages off the event loop
+        self.profile_cache = TTLCache(PROFILE_CACHE_SIZE, PROFILE_CACHE_TTL, PROFILE_CACHE_STALE_TTL)  # key -> PlayerProfile
+        self._refresh_tasks = {}  # cache key -> background refresh task
+        self._inflight = SingleFlight()  # coalesces concurrent scrapes of the same URL
+        self._leaderboard_snapshot = None  # last parsed homepage, see get_leaderboard_snapshot
+        self.page_cache = TTLCache(PAGE_CACHE_SIZE, PAGE_CACHE_TTL)  # url -> validators, body hash and compact parse result
+        self.pages_not_modified = 0  # 304 responses
+        self.pages_unchanged = 0  # 200 responses with the same body as last time
+        self.last_success_at = None  # time.time() of the last non-error response from the site
+        self.name_index = PrefixIndex()  # every player name seen, for autocomplete
+        self.fuzzy_index = TrigramIndex()  # the same names, for "did you mean" suggestions
+    
+    async def close(self):
+        """Release pooled HTTP connections and parse workers."""
+        await self.http.close()
+        self.parse_pool.close()
     
     async def get_player_profile(self, username: str) -> Optional[Dict[str, Any]]:
+        """Get player profile, served from the profile cache when possible."""
+        key = username.strip().lower()
+        
+        record, state = self.profile_cache.lookup(key)
+        if state == FRESH:
+            return record.to_dict()
+        
+        if state == STALE:
+            # Serve the old profile now and refresh it in the background
+            if key not in self._refresh_tasks:
+                task = asyncio.create_task(self._refresh_player_profile(username, key))
+                self._refresh_tasks[key] = task
+                task.add_done_callback(lambda _: self._refresh_tasks.pop(key, None))
+            return record.to_dict()
+        
+        profile_data = await self._fetch_player_profile(username)
+        if profile_data and 'cached_at' not in profile_data:
+            # Stored fallbacks are not cached, so the next lookup retries the site
+            self.profile_cache.set(key, PlayerProfile.from_dict(profile_data))
+        
+        return profile_data
+    
+    async def get_player_profiles(self, usernames: List[str], deadline: float = COMPARE_DEADLINE,
+                                  concurrency: int = COMPARE_CONCURRENCY) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Get several profiles concurrently within one overall deadline.
+        
+        Returns {username: profile or None}. Usernames still loading when the
+        deadline passes are left out, so callers get partial results.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def fetch(username: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await self.get_player_profile(username)
+        
+        tasks = {username: asyncio.ensure_future(fetch(username)) for username in usernames}
+        if not tasks:
+            return {}
+        
+        done, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+        for task in pending:
+            task.cancel()
+        
+        profiles = {}
+        for username, task in tasks.items():
+            if task in done:
+                if task.exception() is not None:
+                    print(f"Error fetching {username} for comparison: {task.exception()}")
+                    profiles[username] = None
+                else:
+                    profiles[username] = task.result()
+        return profiles
+    
+    async def _refresh_player_profile(self, username: str, key: str):
+        """Re-scrape a stale cached profile."""
+        profile_data = await self._fetch_player_profile(username)
+        if profile_data and 'cached_at' not in profile_data:
+            self.profile_cache.set(key, PlayerProfile.from_dict(profile_data))
+    
+    def get_upstream_stats(self) -> Dict[str, Any]:
+        """Rate limit, concurrency and circuit breaker state for requests to the ratings site."""
+        return self.governor.stats()
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Hit, miss and eviction counters for the scraper caches."""
+        return {
+            'profiles': self.profile_cache.stats(),
+            'requests': self._inflight.stats(),
+            'pages': dict(self.page_cache.stats(), not_modified=self.pages_not_modified, unchanged=self.pages_unchanged)
+        }
+    
+    async def _fetch_player_profile(self, username: str) -> Optional[Dict[str, Any]]:
+        """Scrape a profile, sharing one request between concurrent callers."""
+        url = f"{RTANKS_USER_URL}/{username}"
+        # Keyed like the profile cache, so "Foo" and "foo" share one request
+        key = ('profile', username.strip().lower())
+        return await self._inflight.do(key, lambda: self._scrape_player_profile(username, url))
+    
+    async def _scrape_player_profile(self, username: str, url: str) -> Optional[Dict[str, Any]]:
         """Scrape player profile from RTanks ratings website."""
         try:
-            url = f"{RTANKS_USER_URL}/{username}"
-            
-            # Run in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None, 
-                lambda: self.session.get(url, timeout=REQUEST_TIMEOUT)
-            )
+            response, profile_data = await self._fetch_page(url, 'profile')
+            fresh = profile_data is None
             
-            if response.status_code != 200:
-                return None
+            if response.status_code >= 500:
+                return await self._stored_profile(username)
             
-            # Check if we were redirected to homepage (player not found)
-            if response.url.endswith('/') and not response.url.endswith(f'/user/{username}'):
-                return None
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Parse player profile data
-            profile_data = self._parse_player_profile(soup)
+            if profile_data is None:
+                if response.status_code != 200:
+                    return None
+                
+                # Check if we were redirected to homepage (player not found)
+                if response.url.endswith('/') and not response.url.endswith(f'/user/{username}'):
+                    return None
+                
+                # Parse player profile data on a worker
+                profile_data = await self.parse_pool.parse(
+                    parse_profile_page, response.content, self.parser_engine, 'profile'
+                )
+                
+                if profile_data:
+                    self._remember_page(url, response, PlayerProfile.from_dict(profile_data))
+            else:
+                # Unchanged page: a fresh dict from the remembered record
+                profile_data = profile_data.to_dict()
             
             if profile_data:
                 profile_data['username'] = username
                 profile_data['profile_url'] = url
-            
-            return profile_data
-            
-        except Exception as e:
-            print(f"Error scraping player profile for {username}: {e}")
-            return None
-    
-    def _parse_player_profile(self, soup: BeautifulSoup) -> Optional[Dict[str, Any]]:
-        """Parse player profile data from HTML."""
-        try:
-            # Check if this is a redirect page (player not found)
-            if "Found. Redirecting to /" in soup.get_text():
-                return None
-                
-            # Find player name and rank - look for the stats container
-            stats_container = soup.find('div', class_='stats container')
-            if not stats_container:
-                return None
-            
-            # Find player name - it's in a bold font tag next to the rank image
-            name_font = stats_container.find('font', style=re.compile(r'font-weight:\s*bold'))
-            if not name_font:
-                return None
                 
-            player_name = name_font.get_text(strip=True)
-            
-            # Find experience/rank progress
-            experience_info = self._find_experience_info(soup)
-            
-            # Determine rank based on XP
-            current_xp = experience_info.get('current_xp', 0)
-            rank = get_rank_from_xp(current_xp)
-            rank_progress = get_rank_progress(current_xp)
-            
-            # Find leaderboard positions
-            leaderboard_positions = self._find_leaderboard_positions(soup)
-            
-            # Find personal statistics
-            personal_stats = self._find_personal_stats(soup)
-            
-            # Find equipment info
-            equipment = self._find_equipment_info(soup)
-            
-            # Check for premium status
-            premium_status = self._check_premium_status(soup)
-            
-            # Find group/clan info
-            group_info = self._find_group_info(soup)
-            
-            return {
-                'name': player_name,
-                'rank': rank,
-                'experience': rank_progress,
-                'leaderboard_positions': leaderboard_positions,
-                'personal_stats': personal_stats,
-                'equipment': equipment,
-                'premium': premium_status,
-                'group': group_info
-            }
-            
-        except Exception as e:
-            print(f"Error parsing player profile: {e}")
-            return None
-    
-    def _find_experience_info(self, soup: BeautifulSoup) -> Dict[str, Any]:
-        """Find experience and rank progress information."""
-        try:
-            # Look for the text_xp div that contains the XP progress
-            text_xp_div = soup.find('div', class_='text_xp')
-            
-            if text_xp_div:
-                progress_text = text_xp_div.get_text(strip=True)
+                self._index_name(profile_data.get('name') or username)
                 
-                # Parse current XP and required XP from text like "125 919 / 156 000"
-                match = re.search(r'(\d+(?:\s+\d+)*)\s*/\s*(\d+(?:\s+\d+)*)', progress_text)
-                if match:
-                    current_xp = parse_number(match.group(1))
-                    required_xp = parse_number(match.group(2))
-                    
-                    return {
-                        'current_xp': current_xp,
-                        'required_xp': required_xp,
-                        'progress_text': progress_text
-                    }
+                # Only new pages are stored; a 304 or identical body is already there
+                if self.store is not None and fresh:
+                    self.store.record_profile(username, profile_data)
             
-            return {
-                'current_xp': 0,
-                'required_xp': 0,
-                'progress_text': 'Unknown'
-            }
-            
-        except Exception as e:
-            print(f"Error finding experience info: {e}")
-            return {'current_xp': 0, 'required_xp': 0, 'progress_text': 'Unknown'}
-    
-    def _find_leaderboard_positions(self, soup: BeautifulSoup) -> Dict[str, Any]:
-        """Find current leaderboard positions."""
-        try:
-            positions = {}
-            
-            # Look for leaderboard table
-            table = soup.find('table')
-            if table:
-                rows = table.find_all('tr')
-                for row in rows:
-                    cells = row.find_all('td')
-                    if len(cells) >= 3:
-                        category = cells[0].get_text(strip=True)
-                        position = cells[1].get_text(strip=True)
-                        value = cells[2].get_text(strip=True)
-                        
-                        # Map Russian categories to English
-                        category_mapping = {
-                            'По опыту': 'experience',
-                            'Голдоловов': 'goldboxes',
-                            'По киллам': 'kills',
-                            'По эффективности': 'efficiency',
-                            'По кристаллам': 'crystals'
-                        }
-                        
-                        eng_category = category_mapping.get(category, category.lower())
-                        positions[eng_category] = {
-                            'position': position,
-                            'value': value
-                        }
-            
-            return positions
+            return profile_data
             
         except Exception as e:
-            print(f"Error finding leaderboard positions: {e}")
-            return {}
+            print(f"Error scraping player profile for {username}: {e}")
+            return await self._stored_profile(username)
     
-    def _find_personal_stats(self, soup: BeautifulSoup) -> Dict[str, Any]:
-        """Find personal statistics like kills, deaths, KD ratio."""
+    async def _fetch_page(self, url: str, page: str):
+        """GET a page, revalidating it against the copy we parsed last time.
+        
+        Returns (response, previous parse result). The parse result is None
+        unless the site answered 304 Not Modified or sent a byte-identical body.
+        ``page`` labels the request in the metrics ('profile' or 'leaderboard').
+        """
+        previous = self.page_cache.get(url)
+        
+        headers = {}
+        if previous:
+            if previous['etag']:
+                headers['If-None-Match'] = previous['etag']
+            if previous['last_modified']:
+                headers['If-Modified-Since'] = previous['last_modified']
+        
+        start = time.perf_counter()
         try:
-            stats = {}
-            
-            # Look for tables containing personal statistics
-            tables = soup.find_all('table')
-            for table in tables:
-                rows = table.find_all('tr')
-                for row in rows:
-                    cells = row.find_all('td')
-                    if len(cells) >= 2:
-                        key = cells[0].get_text(strip=True)
-                        value = cells[1].get_text(strip=True)
-                        
-                        # Map Russian stats to English
-                        if 'Уничтожил' in key:
-                            stats['kills'] = parse_number(value)
-                        elif 'Подбит' in key:
-                            stats['deaths'] = parse_number(value)
-                        elif 'У/П' in key:
-                            try:
-                                stats['kd_ratio'] = float(value.replace(',', '.'))
-                            except ValueError:
-                                stats['kd_ratio'] = 0.0
-                        elif 'золотых ящиков' in key:
-                            stats['goldboxes'] = parse_number(value)
-                        elif 'Группа' in key:
-                            stats['group'] = translate_russian_to_english(value)
-                        elif 'Премиум' in key:
-                            stats['premium'] = 'Да' in value
-            
-            return stats
-            
-        except Exception as e:
-            print(f"Error finding personal stats: {e}")
-            return {}
+            response = await self.governor.request(lambda: self.http.get(url, headers))
+        except Exception:
+            UPSTREAM_RESPONSES.inc(page, 'error')
+            raise
+        finally:
+            FETCH_SECONDS.observe(time.perf_counter() - start, page)
+        UPSTREAM_RESPONSES.inc(page, str(response.status_code))
+        
+        if response.status_code < 400:
+            self.last_success_at = time.time()
+        
+        if previous is None:
+            return response, None
+        
+        if response.status_code == 304:
+            self.pages_not_modified += 1
+            return response, previous['parsed']
+        
+        if response.status_code == 200 and self._body_hash(response.content) == previous['hash']:
+            self.pages_unchanged += 1
+            # Pick up new validators, if any, for the next request
+            self._remember_page(url, response, previous['parsed'])
+            return response, previous['parsed']
+        
+        return response, None
     
-    def _find_equipment_info(self, soup: BeautifulSoup) -> Dict[str, Any]:
-        """Find currently equipped items."""
-        try:
-            equipment = {
-                'turret': None,
-                'hull': None,
-                'paint': None,
-                'resistances': []
-            }
-            
-            # Look for equipment sections
-            # Equipment items are typically shown with "Установленный: Да"
-            equipment_sections = soup.find_all('div', class_=re.compile(r'equipment|item'))
-            
-            for section in equipment_sections:
-                if 'Установленный' in section.get_text():
-                    if 'Да' in section.get_text():
-                        # This item is equipped
-                        item_name = section.find('h3') or section.find('h4')
-                        if item_name:
-                            name = parse_equipment_name(item_name.get_text(strip=True))
-                            
-                            # Translate and determine equipment type based on name
-                            translated_name = translate_russian_to_english(name)
-                            if any(turret in translated_name.lower() for turret in ['freeze', 'smoky', 'isida', 'hammer', 'twins', 'flamethrower']):
-                                equipment['turret'] = translated_name
-                            elif any(hull in translated_name.lower() for hull in ['hunter', 'wasp', 'dictator', 'titan', 'viking', 'hornet']):
-                                equipment['hull'] = translated_name
-                            elif any(resist in translated_name.lower() for resist in ['dolphin', 'ocelot', 'badger', 'wolf', 'panther']):
-                                equipment['resistances'].append(translated_name)
-            
-            # Look for paint (colormap) - typically has "Установленный: Да"
-            paint_sections = soup.find_all(string=re.compile(r'Фотон|Граффити|Ирбис|Атом'))
-            for paint_section in paint_sections:
-                parent = paint_section.parent
-                if parent and 'Установленный' in parent.get_text() and 'Да' in parent.get_text():
-                    equipment['paint'] = translate_russian_to_english(paint_section.strip())
-                    break
-            
-            return equipment
-            
-        except Exception as e:
-            print(f"Error finding equipment info: {e}")
-            return {'turret': None, 'hull': None, 'paint': None, 'resistances': []}
+    def _remember_page(self, url: str, response: Any, parsed: Any):
+        """Keep a page's validators and body hash next to its parse result."""
+        self.page_cache.set(url, {
+            'etag': response.header('ETag'),
+            'last_modified': response.header('Last-Modified'),
+            'hash': self._body_hash(response.content),
+            'parsed': parsed
+        })
     
-    def _check_premium_status(self, soup: BeautifulSoup) -> bool:
-        """Check if player has premium status."""
-        try:
-            # Look for premium status in personal stats
-            premium_text = soup.find(string=re.compile(r'Премиум'))
-            if premium_text:
-                parent = premium_text.parent
-                if parent:
-                    return 'Да' in parent.get_text()
-            
-            return False
-            
-        except Exception as e:
-            print(f"Error checking premium status: {e}")
-            return False
+    @staticmethod
+    def _body_hash(content: bytes) -> bytes:
+        return hashlib.blake2b(content, digest_size=16).digest()
     
-    def _find_group_info(self, soup: BeautifulSoup) -> str:
-        """Find group/clan information."""
+    async def _stored_profile(self, username: str) -> Optional[Dict[str, Any]]:
+        """Last stored profile of a player, for when the ratings site is unavailable."""
+        if self.store is None:
+            return None
+        
         try:
-            # Look for group information
-            group_text = soup.find(string=re.compile(r'Группа'))
-            if group_text:
-                parent = group_text.parent
-                if parent:
-                    # Find the value cell
-                    next_cell = parent.find_next_sibling('td')
-                    if next_cell:
-                        return translate_russian_to_english(next_cell.get_text(strip=True))
-            
-            return "No Group"
-            
+            return await self.store.latest_profile(username)
         except Exception as e:
-            print(f"Error finding group info: {e}")
-            return "No Group"
+            print(f"Error loading stored profile for {username}: {e}")
+            return None
     
     async def get_leaderboard(self, category: str = "experience", page: int = 1) -> Optional[Dict[str, Any]]:
         """Get leaderboard data for specified category and page."""
         try:
-            # Calculate offset for pagination (10 players per page)
-            offset = (page - 1) * 10
-            
-            # RTanks shows top 100 by default, we'll parse and paginate
-            url = RTANKS_LEADERBOARD_URL
-            
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.session.get(url, timeout=REQUEST_TIMEOUT)
-            )
-            
-            if response.status_code != 200:
-                return None
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Parse leaderboard data
-            leaderboard_data = self._parse_leaderboard(soup, category)
+            snapshot = await self.get_leaderboard_snapshot()
             
-            if not leaderboard_data:
+            if not snapshot:
                 return None
             
-            # Apply pagination
-            players = leaderboard_data['players']
-            total_players = len(players)
-            
-            start_idx = offset
-            end_idx = min(start_idx + 10, total_players)
-            
-            paginated_players = players[start_idx:end_idx]
-            
-            return {
-                'category': category,
-                'page': page,
-                'total_pages': (total_players + 9) // 10,  # Ceiling division
-                'total_players': total_players,
-                'players': paginated_players,
-                'has_next': end_idx < total_players,
-                'has_previous': page > 1
-            }
+            return self.paginate_leaderboard(snapshot, category, page)
             
         except Exception as e:
             print(f"Error getting leaderboard: {e}")
             return None
     
-    def _parse_leaderboard(self, soup: BeautifulSoup, category: str) -> Optional[Dict[str, Any]]:
-        """Parse leaderboard data from HTML."""
+    async def get_player_standing(self, username: str) -> Optional[Dict[str, Any]]:
+        """Where a player stands in every leaderboard category, from the homepage snapshot.
+        
+        Returns None when no snapshot is available. 'categories' maps each
+        category the player appears in to their position and value.
+        """
+        snapshot = await self.get_leaderboard_snapshot()
+        if not snapshot:
+            return None
+        
+        entry = snapshot['positions'].get(username.strip().lower())
+        return {
+            'name': entry['name'] if entry else username.strip(),
+            'categories': entry['categories'] if entry else {},
+            'fetched_at': snapshot['fetched_at']
+        }
+    
+    def _build_position_index(self, categories: Dict[str, List[LeaderboardRow]]) -> Dict[str, Dict[str, Any]]:
+        """Map each lowercased player name to their position and value in every category."""
+        positions = {}
+        for category, players in categories.items():
+            for player in players:
+                entry = positions.get(player.name.lower())
+                if entry is None:
+                    entry = positions[player.name.lower()] = {'name': player.name, 'categories': {}}
+                entry['categories'][category] = {
+                    'position': player.position,
+                    'value': player.value
+                }
+        return positions
+    
+    async def get_leaderboard_snapshot(self, force_refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """Get the parsed homepage with every leaderboard category.
+        
+        The snapshot is refetched once it is older than LEADERBOARD_REFRESH_INTERVAL.
+        If the refresh fails the last good snapshot is returned.
+        """
+        snapshot = self._leaderboard_snapshot
+        
+        if snapshot and not force_refresh:
+            if time.time() - snapshot['fetched_at'] < LEADERBOARD_REFRESH_INTERVAL:
+                return snapshot
+        
+        new_snapshot = await self.refresh_leaderboard_snapshot()
+        return new_snapshot or snapshot or await self.restore_leaderboard_snapshot()
+    
+    async def refresh_leaderboard_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Refetch the homepage snapshot. Returns None (keeping the old one) on failure."""
+        new_snapshot = await self._fetch_leaderboard_snapshot()
+        if new_snapshot:
+            self._leaderboard_snapshot = new_snapshot
+        return new_snapshot
+    
+    async def restore_leaderboard_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Load the last stored snapshot when none has been fetched since startup."""
+        if self._leaderboard_snapshot is None and self.store is not None:
+            try:
+                self._leaderboard_snapshot = await self.store.latest_leaderboard()
+            except Exception as e:
+                print(f"Error loading stored leaderboard: {e}")
+            
+            if self._leaderboard_snapshot:
+                self._leaderboard_snapshot['categories'] = compact_leaderboard(self._leaderboard_snapshot['categories'])
+                self._leaderboard_snapshot['positions'] = self._build_position_index(self._leaderboard_snapshot['categories'])
+                self._index_leaderboard_names(self._leaderboard_snapshot['categories'])
+        return self._leaderboard_snapshot
+    
+    def _index_leaderboard_names(self, categories: Dict[str, List[LeaderboardRow]]):
+        """Feed every name on the leaderboards to the name indexes."""
+        self._index_names([player.name for players in categories.values() for player in players])
+    
+    def _index_names(self, names: List[str]):
+        """Add a batch of names; the prefix index re-sorts once for all of them."""
+        self.name_index.update(names)
+        self.fuzzy_index.update(names)
+    
+    def _index_name(self, name: str):
+        """Add one name with a single insert, without re-sorting the whole index."""
+        self.name_index.add(name)
+        self.fuzzy_index.add(name)
+    
+    def suggest_player_names(self, username: str, limit: int = SUGGESTION_LIMIT) -> List[str]:
+        """Known player names closest to a username that was not found."""
+        return [name for name in self.fuzzy_index.closest(username, limit + 1) if name.lower() != username.strip().lower()][:limit]
+    
+    async def _fetch_leaderboard_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Fetch the homepage, sharing one request between concurrent callers."""
+        url = RTANKS_LEADERBOARD_URL
+        return await self._inflight.do(url, lambda: self._scrape_leaderboard_snapshot(url))
+    
+    async def _scrape_leaderboard_snapshot(self, url: str) -> Optional[Dict[str, Any]]:
+        """Download and parse the homepage leaderboards."""
         try:
-            players = []
+            # RTanks shows the top 100 of every category on the homepage
+            response, categories = await self._fetch_page(url, 'leaderboard')
+            parsed = None
             
-            # Map category to Russian text to find the right table
-            category_text_map = {
-                'experience': 'по заработанному опыту',
-                'crystals': 'по заработанным кристаллам',
-                'kills': 'по убийствам',
-                'goldboxes': 'по пойманным голдам'
+            if categories is None:
+                if response.status_code != 200:
+                    return None
+                
+                # Parse all leaderboard categories at once, on a worker
+                parsed = await self.parse_pool.parse(
+                    parse_leaderboard_page, response.content, self.parser_engine, 'leaderboard'
+                )
+                
+                if not parsed:
+                    return None
+                
+                categories = compact_leaderboard(parsed)
+                self._remember_page(url, response, categories)
+                self._index_leaderboard_names(categories)
+            
+            snapshot = {
+                'categories': categories,
+                'positions': self._build_position_index(categories),
+                'fetched_at': time.time()
             }
             
-            target_text = category_text_map.get(category, 'по заработанному опыту')
+            if self.store is not None and parsed is not None:
+                # Only new pages are stored (as plain JSON rows); a 304 or identical body is already there
+                self.store.record_leaderboard({'categories': parsed, 'fetched_at': snapshot['fetched_at']})
             
-            # Find the container with the specific category text
-            target_container = None
-            containers = soup.find_all('div', class_='container')
-            
-            for container in containers:
-                if target_text in container.get_text():
-                    target_container = container
-                    break
-            
-            if not target_container:
-                # Fallback to first table if specific category not found
-                target_container = soup
-            
-            # Find the table within the target container
-            table = target_container.find('table')
-            if not table:
-                return None
-            
-            rows = table.find_all('tr')
-            
-            for row in rows:
-                cells = row.find_all('td')
-                if len(cells) >= 3:
-                    # Extract position
-                    position = cells[0].get_text(strip=True)
-                    
-                    # Extract player info from second cell
-                    player_cell = cells[1]
-                    player_link = player_cell.find('a')
-                    player_img = player_cell.find('img')
-                    
-                    if player_link and player_img:
-                        player_name = player_link.get_text(strip=True)
-                        player_url = player_link.get('href', '')
-                        rank = parse_rank_from_image(player_img.get('src', ''))
-                        
-                        # Extract value from third cell
-                        value = parse_number(cells[2].get_text(strip=True))
-                        
-                        players.append({
-                            'position': int(position) if position.isdigit() else 0,
-                            'name': player_name,
-                            'rank': rank,
-                            'value': value,
-                            'profile_url': f"{RTANKS_BASE_URL}{player_url}" if player_url else None
-                        })
-            
-            return {
-                'category': category,
-                'players': players
-            }
+            return snapshot
             
         except Exception as e:
-            print(f"Error parsing leaderboard: {e}")
+            print(f"Error fetching leaderboard: {e}")
             return None
+    
+    def paginate_leaderboard(self, snapshot: Dict[str, Any], category: str, page: int) -> Dict[str, Any]:
+        """Slice one page of a category out of a leaderboard snapshot."""
+        players = snapshot['categories'].get(category, [])
+        total_players = len(players)
+        
+        # Calculate offset for pagination
+        start_idx = (page - 1) * LEADERBOARD_PAGE_SIZE
+        end_idx = min(start_idx + LEADERBOARD_PAGE_SIZE, total_players)
+        
+        return {
+            'category': category,
+            'page': page,
+            'total_pages': (total_players + LEADERBOARD_PAGE_SIZE - 1) // LEADERBOARD_PAGE_SIZE,  # Ceiling division
+            'total_players': total_players,
+            'players': [player.to_dict() for player in players[start_idx:end_idx]],
+            'has_next': end_idx < total_players,
+            'has_previous': page > 1
+        }
@@ -0,0 +1,32 @@
+"""
+Cold-start timing. main.py imports this module first, and each startup
+phase is marked relative to that moment.
+"""
+
+import time
+from typing import List, Tuple
+from metrics import STARTUP_SECONDS
+
+_started = time.perf_counter()
+_phases: List[Tuple[str, float]] = []  # (phase, seconds since start), in order
+
+
+def mark(phase: str):
+    """Record that a startup phase has finished."""
+    elapsed = time.perf_counter() - _started
+    _phases.append((phase, elapsed))
+    STARTUP_SECONDS.set(elapsed, phase)
+
+
+def is_marked(phase: str) -> bool:
+    return any(name == phase for name, _ in _phases)
+
+
+def report() -> str:
+    """One line with the cumulative time of every phase and the time spent in it."""
+    parts = []
+    previous = 0.0
+    for phase, elapsed in _phases:
+        parts.append(f"{phase} {elapsed:.2f}s (+{elapsed - previous:.2f}s)")
+        previous = elapsed
+    return "Startup: " + ", ".join(parts)
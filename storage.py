@@ -0,0 +1,229 @@
+"""
+Persistent SQLite store for scraped profiles and leaderboard snapshots.
+
+Every database call runs on one dedicated thread, so the event loop never
+blocks on disk I/O. Writes are queued and flushed in batches.
+"""
+
+import asyncio
+import json
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from config import *
+from metrics import executor_queue_depth
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    id INTEGER PRIMARY KEY,
+    username TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_profiles_username_time ON profiles (username, fetched_at);
+CREATE INDEX IF NOT EXISTS idx_profiles_time ON profiles (fetched_at);
+
+CREATE TABLE IF NOT EXISTS leaderboards (
+    id INTEGER PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_leaderboards_time ON leaderboards (fetched_at);
+"""
+
+
+class SnapshotStore:
+    def __init__(self, path: str = STORE_PATH):
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='snapshot-store')
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pending_profiles: List[Tuple[str, float, str]] = []
+        self._pending_leaderboards: List[Tuple[float, str]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._maintenance_task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start periodic retention/compaction on the running event loop."""
+        if self._maintenance_task is None or self._maintenance_task.done():
+            self._maintenance_task = asyncio.create_task(self._maintenance_loop())
+
+    async def close(self):
+        """Flush pending writes and close the database."""
+        for task in (self._maintenance_task, self._flush_task):
+            if task is not None:
+                task.cancel()
+        self._maintenance_task = self._flush_task = None
+
+        await self.flush()
+        await self._run(self._close_connection)
+        self._executor.shutdown(wait=True)
+
+    def queue_depth(self) -> int:
+        """Database calls waiting for the store thread."""
+        return executor_queue_depth(self._executor)
+
+    # --- Writes -----------------------------------------------------------------
+
+    def record_profile(self, username: str, profile_data: Dict[str, Any], fetched_at: Optional[float] = None):
+        """Queue a parsed profile for the next batch write."""
+        fetched_at = fetched_at or time.time()
+        self._pending_profiles.append((username.strip().lower(), fetched_at, json.dumps(profile_data, ensure_ascii=False)))
+        self._schedule_flush()
+
+    def record_leaderboard(self, snapshot: Dict[str, Any]):
+        """Queue a leaderboard snapshot for the next batch write."""
+        self._pending_leaderboards.append((snapshot['fetched_at'], json.dumps(snapshot['categories'], ensure_ascii=False)))
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        pending = len(self._pending_profiles) + len(self._pending_leaderboards)
+        if pending >= STORE_BATCH_SIZE:
+            asyncio.ensure_future(self.flush())
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.ensure_future(self._delayed_flush())
+
+    async def _delayed_flush(self):
+        await asyncio.sleep(STORE_FLUSH_INTERVAL)
+        await self.flush()
+
+    async def flush(self):
+        """Write every queued snapshot in one transaction."""
+        profiles, self._pending_profiles = self._pending_profiles, []
+        leaderboards, self._pending_leaderboards = self._pending_leaderboards, []
+        if not profiles and not leaderboards:
+            return
+
+        try:
+            await self._run(self._write_batch, profiles, leaderboards)
+        except Exception as e:
+            print(f"Error writing snapshots: {e}")
+
+    def _write_batch(self, profiles: List[Tuple[str, float, str]], leaderboards: List[Tuple[float, str]]):
+        conn = self._connection()
+        with conn:
+            conn.executemany("INSERT INTO profiles (username, fetched_at, data) VALUES (?, ?, ?)", profiles)
+            conn.executemany("INSERT INTO leaderboards (fetched_at, data) VALUES (?, ?)", leaderboards)
+
+    # --- Reads ------------------------------------------------------------------
+
+    async def latest_profile(self, username: str) -> Optional[Dict[str, Any]]:
+        """Most recent stored profile, with 'cached_at' set to when it was scraped."""
+        row = await self._run(
+            self._fetch_one,
+            "SELECT fetched_at, data FROM profiles WHERE username = ? ORDER BY fetched_at DESC LIMIT 1",
+            (username.strip().lower(),)
+        )
+        if row is None:
+            return None
+
+        profile_data = json.loads(row[1])
+        profile_data['cached_at'] = row[0]
+        return profile_data
+
+    async def profile_history(self, username: str, since: float = 0, until: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Stored profiles of a player between two timestamps, oldest first."""
+        rows = await self._run(
+            self._fetch_all,
+            "SELECT fetched_at, data FROM profiles WHERE username = ? AND fetched_at BETWEEN ? AND ? ORDER BY fetched_at",
+            (username.strip().lower(), since, until if until is not None else time.time())
+        )
+        history = []
+        for fetched_at, data in rows:
+            profile_data = json.loads(data)
+            profile_data['cached_at'] = fetched_at
+            history.append(profile_data)
+        return history
+
+    async def latest_leaderboard(self) -> Optional[Dict[str, Any]]:
+        """Most recent stored leaderboard snapshot."""
+        row = await self._run(
+            self._fetch_one,
+            "SELECT fetched_at, data FROM leaderboards ORDER BY fetched_at DESC LIMIT 1",
+            ()
+        )
+        if row is None:
+            return None
+        return {'categories': json.loads(row[1]), 'fetched_at': row[0]}
+
+    def _fetch_one(self, query: str, params: tuple) -> Optional[tuple]:
+        return self._connection().execute(query, params).fetchone()
+
+    def _fetch_all(self, query: str, params: tuple) -> List[tuple]:
+        return self._connection().execute(query, params).fetchall()
+
+    # --- Retention and compaction ----------------------------------------------
+
+    async def _maintenance_loop(self):
+        while True:
+            try:
+                await self.compact()
+            except Exception as e:
+                print(f"Error compacting snapshot store: {e}")
+            await asyncio.sleep(STORE_COMPACT_INTERVAL)
+
+    async def compact(self):
+        """Apply the retention policy and thin out old profile and leaderboard history."""
+        await self._run(self._compact)
+
+    def _compact(self):
+        now = time.time()
+        retention_cutoff = now - STORE_RETENTION_DAYS * 86400
+        compact_cutoff = now - STORE_COMPACT_AFTER_DAYS * 86400
+        # Aligned to an hour boundary, so the hour still being filled is left alone
+        hourly_cutoff = now - now % 3600
+
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM profiles WHERE fetched_at < ?", (retention_cutoff,))
+            conn.execute("DELETE FROM leaderboards WHERE fetched_at < ?", (retention_cutoff,))
+
+            # Past the compaction age keep only the last profile per player per day
+            self._thin_out(conn, 'profiles', 'username', 86400, compact_cutoff)
+
+            # Leaderboards are fetched every few minutes: keep the last one per hour,
+            # and per day past the compaction age
+            self._thin_out(conn, 'leaderboards', None, 3600, hourly_cutoff)
+            self._thin_out(conn, 'leaderboards', None, 86400, compact_cutoff)
+
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def _thin_out(self, conn: sqlite3.Connection, table: str, group_by: Optional[str], period: int, cutoff: float):
+        """Delete rows before cutoff except the newest per group_by column and period seconds."""
+        partition = f"{group_by}, " if group_by else ""
+        conn.execute(
+            f"""
+            DELETE FROM {table}
+            WHERE fetched_at < ? AND id NOT IN (
+                SELECT id FROM (
+                    SELECT id, ROW_NUMBER() OVER (
+                        PARTITION BY {partition}CAST(fetched_at / ? AS INTEGER)
+                        ORDER BY fetched_at DESC
+                    ) AS period_rank
+                    FROM {table} WHERE fetched_at < ?
+                ) WHERE period_rank = 1
+            )
+            """,
+            (cutoff, period, cutoff)
+        )
+
+    # --- Connection -------------------------------------------------------------
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database on the store thread on first use."""
+        if self._conn is None:
+            conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _close_connection(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
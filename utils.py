@@ -1,7 +1,198 @@
 import re
+from functools import lru_cache
 from typing import Optional, Dict, Any
 from config import RANK_EMOJIS, GOLDBOX_EMOJI, PREMIUM_EMOJI
 
+# Map known rank image hashes to ranks (from scraped data)
+RANK_IMAGE_TO_KEY = {
+    "M4GBQIq": "recruit",
+    "O6Tb9li": "private",
+    "sppjRis": "gefreiter",
+    "UWup9qJ": "corporal",
+    "lTXxLVJ": "sergeant",
+    "AYAs02w": "staff-sergeant",
+    "Ljy2jDX": "sergeant-first-class",
+    "GzJRzgz": "master-sergeant", 
+    "a3UCeT5": "first-sergeant",
+    "rCN2gJm": "sergeant-major",
+    "GzJRzgz": "third-lieutenant",
+    "BIr8vRX": "second-lieutenant",
+    "dSE90bT": "first-lieutenant",
+    "BNZpCPo": "captain",
+    "pxzNyxi": "major",
+    "rO3Hs5f": "lieutenant-colonel",
+    "LATOpxZ": "colonel",
+    "R69LmLt": "brigadier",
+    "iTyjOt3": "major-general",
+    "Q2YgFQ1": "lieutenant-general",
+    "ekbJYyf": "general",
+    "paF1myt": "marshal",
+    "wPZnaG0": "field-marshal",
+    "Or6Ajto": "commander",
+    "OQEHkm7": "generalissimo",
+    "rO3Hs5f": "legend-premium"
+}
+
+# Equipment names shown on profiles
+EQUIPMENT_TRANSLATIONS = {
+    "Фриз": "Freeze",
+    "Смоки": "Smoky", 
+    "Изида": "Isida",
+    "Молот": "Hammer",
+    "Твинс": "Twins",
+    "Огнемет": "Flamethrower",
+    "Хантер": "Hunter",
+    "Васп": "Wasp",
+    "Диктатор": "Dictator",
+    "Титан": "Titan",
+    "Викинг": "Viking",
+    "Хорнет": "Hornet"
+}
+
+# Russian text on the ratings site and its English translation
+RUSSIAN_TO_ENGLISH = {
+    # Group/Clan translations
+    "Игрок": "Player",
+    "Клан": "Clan",
+    "Группа": "Group",
+    
+    # General translations
+    "Да": "Yes",
+    "Нет": "No",
+    "Неизвестно": "Unknown",
+    "Нет группы": "No Group",
+    
+    # Rank translations
+    "Рекрут": "Recruit",
+    "Рядовой": "Private",
+    "Ефрейтор": "Gefreiter",
+    "Капрал": "Corporal",
+    "Сержант": "Sergeant",
+    "Штаб-сержант": "Staff Sergeant",
+    "Старший сержант": "Sergeant First Class",
+    "Мастер-сержант": "Master Sergeant",
+    "Первый сержант": "First Sergeant",
+    "Сержант-майор": "Sergeant Major",
+    "Уорэнт-офицер 1": "Warrant Officer 1",
+    "Уорэнт-офицер 2": "Chief Warrant Officer 2",
+    "Уорэнт-офицер 3": "Chief Warrant Officer 3",
+    "Уорэнт-офицер 4": "Chief Warrant Officer 4",
+    "Уорэнт-офицер 5": "Chief Warrant Officer 5",
+    "Младший лейтенант": "Third Lieutenant",
+    "Младший лейтенант": "Second Lieutenant",
+    "Лейтенант": "First Lieutenant",
+    "Капитан": "Captain",
+    "Майор": "Major",
+    "Подполковник": "Lieutenant Colonel",
+    "Полковник": "Colonel",
+    "Бригадир": "Brigadier",
+    "Генерал-майор": "Major General",
+    "Генерал-лейтенант": "Lieutenant General",
+    "Генерал": "General",
+    "Маршал": "Marshal",
+    "Фельдмаршал": "Field Marshal",
+    "Командующий": "Commander",
+    "Генералиссимус": "Generalissimo",
+    "Легенда": "Legend",
+    "Легенда 2": "Legend 2",
+    "Легенда 3": "Legend 3",
+    "Легенда 4": "Legend 4",
+    "Легенда 5": "Legend 5",
+    
+    # Equipment translations
+    "Фриз": "Freeze",
+    "Смоки": "Smoky",
+    "Изида": "Isida", 
+    "Молот": "Hammer",
+    "Твинс": "Twins",
+    "Огнемет": "Flamethrower",
+    "Хантер": "Hunter",
+    "Васп": "Wasp",
+    "Диктатор": "Dictator",
+    "Титан": "Titan",
+    "Викинг": "Viking",
+    "Хорнет": "Hornet",
+    
+    # Paint translations
+    "Зелёный": "Green",
+    "Праздник": "Holiday",
+    "Премиум": "Premium",
+    "Пижама": "Pajamas",
+    "Граффити": "Graffiti",
+    "Янтарь": "Amber",
+    "Кольчуга": "Chainmail",
+    "Мэри": "Mary",
+    "С Любовью": "With Love",
+    "Атом": "Atom",
+    "Ирбис": "Irbis",
+    "Вихрь": "Vortex",
+    "Луноход": "Moonwalker",
+    "Пустыня": "Desert",
+    "Синий": "Blue",
+    "Тундра": "Tundra",
+    "Ягуар": "Jaguar",
+    "Фотон": "Photon",
+    
+    # Resistance translations
+    "Дельфин": "Dolphin",
+    "Оцелот": "Ocelot",
+    "Барсук": "Badger",
+    "Волк": "Wolf",
+    "Пантера": "Panther"
+}
+
+# Rank text to config key mapping
+RANK_TEXT_TO_KEY = {
+    "Recruit": "recruit",
+    "Private": "private",
+    "Gefreiter": "gefreiter",
+    "Corporal": "corporal",
+    "Sergeant": "sergeant",
+    "Staff Sergeant": "staff-sergeant",
+    "Sergeant First Class": "sergeant-first-class",
+    "Master Sergeant": "master-sergeant",
+    "First Sergeant": "first-sergeant",
+    "Sergeant Major": "sergeant-major",
+    "Warrant Officer 1": "warrant-officer-1",
+    "Chief Warrant Officer 2": "warrant-officer-2",
+    "Chief Warrant Officer 3": "warrant-officer-3",
+    "Chief Warrant Officer 4": "warrant-officer-4",
+    "Chief Warrant Officer 5": "warrant-officer-5",
+    "Third Lieutenant": "third-lieutenant",
+    "Second Lieutenant": "second-lieutenant",
+    "First Lieutenant": "first-lieutenant",
+    "Captain": "captain",
+    "Major": "major",
+    "Lieutenant Colonel": "lieutenant-colonel",
+    "Colonel": "colonel",
+    "Brigadier": "brigadier",
+    "Major General": "major-general",
+    "Lieutenant General": "lieutenant-general",
+    "General": "general",
+    "Marshal": "marshal",
+    "Field Marshal": "field-marshal",
+    "Commander": "commander",
+    "Generalissimo": "generalissimo",
+    "Legend": "legend-premium",
+    "Legend 2": "legend-premium",
+    "Legend 3": "legend-premium",
+    "Legend 4": "legend-premium",
+    "Legend 5": "legend-premium"
+}
+
+def _longest_first_pattern(phrases) -> "re.Pattern":
+    """One alternation regex that prefers the longest phrase at each position."""
+    return re.compile('|'.join(re.escape(phrase) for phrase in sorted(phrases, key=len, reverse=True)))
+
+_TRANSLATION_RE = _longest_first_pattern(RUSSIAN_TO_ENGLISH)
+_EQUIPMENT_RE = _longest_first_pattern(EQUIPMENT_TRANSLATIONS)
+
+def _replace_translation(match: "re.Match") -> str:
+    return RUSSIAN_TO_ENGLISH[match.group(0)]
+
+def _replace_equipment(match: "re.Match") -> str:
+    return EQUIPMENT_TRANSLATIONS[match.group(0)]
+
 def parse_rank_from_image(img_url: str) -> str:
     """Extract rank name from rank image URL."""
     if not img_url:
@@ -10,37 +201,7 @@ def parse_rank_from_image(img_url: str) -> str:
     # Extract filename from URL like https://i.imgur.com/rCN2gJm.png
     filename = img_url.split('/')[-1].split('.')[0]
     
-    # Map known image hashes to ranks (from scraped data)
-    rank_mapping = {
-        "M4GBQIq": "recruit",
-        "O6Tb9li": "private",
-        "sppjRis": "gefreiter",
-        "UWup9qJ": "corporal",
-        "lTXxLVJ": "sergeant",
-        "AYAs02w": "staff-sergeant",
-        "Ljy2jDX": "sergeant-first-class",
-        "GzJRzgz": "master-sergeant", 
-        "a3UCeT5": "first-sergeant",
-        "rCN2gJm": "sergeant-major",
-        "GzJRzgz": "third-lieutenant",
-        "BIr8vRX": "second-lieutenant",
-        "dSE90bT": "first-lieutenant",
-        "BNZpCPo": "captain",
-        "pxzNyxi": "major",
-        "rO3Hs5f": "lieutenant-colonel",
-        "LATOpxZ": "colonel",
-        "R69LmLt": "brigadier",
-        "iTyjOt3": "major-general",
-        "Q2YgFQ1": "lieutenant-general",
-        "ekbJYyf": "general",
-        "paF1myt": "marshal",
-        "wPZnaG0": "field-marshal",
-        "Or6Ajto": "commander",
-        "OQEHkm7": "generalissimo",
-        "rO3Hs5f": "legend-premium"
-    }
-    
-    return rank_mapping.get(filename, "recruit")
+    return RANK_IMAGE_TO_KEY.get(filename, "recruit")
 
 def get_rank_emoji(rank: str) -> str:
     """Get the appropriate emoji for a rank."""
@@ -96,26 +257,7 @@ def parse_equipment_name(equipment_text: str) -> str:
         return "Unknown"
     
     # Extract equipment name (e.g., "Фриз M2" -> "Freeze M2")
-    equipment_translations = {
-        "Фриз": "Freeze",
-        "Смоки": "Smoky", 
-        "Изида": "Isida",
-        "Молот": "Hammer",
-        "Твинс": "Twins",
-        "Огнемет": "Flamethrower",
-        "Хантер": "Hunter",
-        "Васп": "Wasp",
-        "Диктатор": "Dictator",
-        "Титан": "Titan",
-        "Викинг": "Viking",
-        "Хорнет": "Hornet"
-    }
-    
-    for russian, english in equipment_translations.items():
-        if russian in equipment_text:
-            return equipment_text.replace(russian, english)
-    
-    return equipment_text
+    return _EQUIPMENT_RE.sub(_replace_equipment, equipment_text)
 
 def truncate_text(text: str, max_length: int) -> str:
     """Truncate text to maximum length with ellipsis."""
@@ -125,145 +267,16 @@ def truncate_text(text: str, max_length: int) -> str:
 
 def translate_russian_to_english(text: str) -> str:
     """Translate Russian text to English."""
-    russian_to_english = {
-        # Group/Clan translations
-        "Игрок": "Player",
-        "Клан": "Clan",
-        "Группа": "Group",
-        
-        # General translations
-        "Да": "Yes",
-        "Нет": "No",
-        "Неизвестно": "Unknown",
-        "Нет группы": "No Group",
-        
-        # Rank translations
-        "Рекрут": "Recruit",
-        "Рядовой": "Private",
-        "Ефрейтор": "Gefreiter",
-        "Капрал": "Corporal",
-        "Сержант": "Sergeant",
-        "Штаб-сержант": "Staff Sergeant",
-        "Старший сержант": "Sergeant First Class",
-        "Мастер-сержант": "Master Sergeant",
-        "Первый сержант": "First Sergeant",
-        "Сержант-майор": "Sergeant Major",
-        "Уорэнт-офицер 1": "Warrant Officer 1",
-        "Уорэнт-офицер 2": "Chief Warrant Officer 2",
-        "Уорэнт-офицер 3": "Chief Warrant Officer 3",
-        "Уорэнт-офицер 4": "Chief Warrant Officer 4",
-        "Уорэнт-офицер 5": "Chief Warrant Officer 5",
-        "Младший лейтенант": "Third Lieutenant",
-        "Младший лейтенант": "Second Lieutenant",
-        "Лейтенант": "First Lieutenant",
-        "Капитан": "Captain",
-        "Майор": "Major",
-        "Подполковник": "Lieutenant Colonel",
-        "Полковник": "Colonel",
-        "Бригадир": "Brigadier",
-        "Генерал-майор": "Major General",
-        "Генерал-лейтенант": "Lieutenant General",
-        "Генерал": "General",
-        "Маршал": "Marshal",
-        "Фельдмаршал": "Field Marshal",
-        "Командующий": "Commander",
-        "Генералиссимус": "Generalissimo",
-        "Легенда": "Legend",
-        "Легенда 2": "Legend 2",
-        "Легенда 3": "Legend 3",
-        "Легенда 4": "Legend 4",
-        "Легенда 5": "Legend 5",
-        
-        # Equipment translations
-        "Фриз": "Freeze",
-        "Смоки": "Smoky",
-        "Изида": "Isida", 
-        "Молот": "Hammer",
-        "Твинс": "Twins",
-        "Огнемет": "Flamethrower",
-        "Хантер": "Hunter",
-        "Васп": "Wasp",
-        "Диктатор": "Dictator",
-        "Титан": "Titan",
-        "Викинг": "Viking",
-        "Хорнет": "Hornet",
-        
-        # Paint translations
-        "Зелёный": "Green",
-        "Праздник": "Holiday",
-        "Премиум": "Premium",
-        "Пижама": "Pajamas",
-        "Граффити": "Graffiti",
-        "Янтарь": "Amber",
-        "Кольчуга": "Chainmail",
-        "Мэри": "Mary",
-        "С Любовью": "With Love",
-        "Атом": "Atom",
-        "Ирбис": "Irbis",
-        "Вихрь": "Vortex",
-        "Луноход": "Moonwalker",
-        "Пустыня": "Desert",
-        "Синий": "Blue",
-        "Тундра": "Tundra",
-        "Ягуар": "Jaguar",
-        "Фотон": "Photon",
-        
-        # Resistance translations
-        "Дельфин": "Dolphin",
-        "Оцелот": "Ocelot",
-        "Барсук": "Badger",
-        "Волк": "Wolf",
-        "Пантера": "Panther"
-    }
-    
     if not text:
         return text
     
-    # Replace Russian text with English
-    for russian, english in russian_to_english.items():
-        text = text.replace(russian, english)
-    
-    return text
+    return _translate(text)
+
+@lru_cache(maxsize=4096)
+def _translate(text: str) -> str:
+    # Longest phrase wins at each position, e.g. "Штаб-сержант" before "Сержант"
+    return _TRANSLATION_RE.sub(_replace_translation, text)
 
 def translate_rank_to_key(rank_text: str) -> str:
     """Convert rank text to config key format."""
-    # Rank text to key mapping
-    rank_to_key = {
-        "Recruit": "recruit",
-        "Private": "private",
-        "Gefreiter": "gefreiter",
-        "Corporal": "corporal",
-        "Sergeant": "sergeant",
-        "Staff Sergeant": "staff-sergeant",
-        "Sergeant First Class": "sergeant-first-class",
-        "Master Sergeant": "master-sergeant",
-        "First Sergeant": "first-sergeant",
-        "Sergeant Major": "sergeant-major",
-        "Warrant Officer 1": "warrant-officer-1",
-        "Chief Warrant Officer 2": "warrant-officer-2",
-        "Chief Warrant Officer 3": "warrant-officer-3",
-        "Chief Warrant Officer 4": "warrant-officer-4",
-        "Chief Warrant Officer 5": "warrant-officer-5",
-        "Third Lieutenant": "third-lieutenant",
-        "Second Lieutenant": "second-lieutenant",
-        "First Lieutenant": "first-lieutenant",
-        "Captain": "captain",
-        "Major": "major",
-        "Lieutenant Colonel": "lieutenant-colonel",
-        "Colonel": "colonel",
-        "Brigadier": "brigadier",
-        "Major General": "major-general",
-        "Lieutenant General": "lieutenant-general",
-        "General": "general",
-        "Marshal": "marshal",
-        "Field Marshal": "field-marshal",
-        "Commander": "commander",
-        "Generalissimo": "generalissimo",
-        "Legend": "legend-premium",
-        "Legend 2": "legend-premium",
-        "Legend 3": "legend-premium",
-        "Legend 4": "legend-premium",
-        "Legend 5": "legend-premium"
-    }
-    
-    return rank_to_key.get(rank_text, "recruit")
+    return RANK_TEXT_TO_KEY.get(rank_text, "recruit")